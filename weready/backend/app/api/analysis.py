@@ -5,15 +5,15 @@ Handle free analysis requests and progress tracking.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-import uuid
 import time
 import os
 
-from app.database.connection import get_db
+from app.database.connection import get_async_db
 from app.models.analysis import Analysis, IssueTracking
 from app.models.user import User
 from app.core.weready_scorer import WeReadyScorer
@@ -23,6 +23,9 @@ API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
 
 router = APIRouter()
 
+# Built once with a bound parameter so each lookup reuses the cached compilation
+_FREE_ANALYSIS = select(Analysis).where(Analysis.id == bindparam("analysis_id"), Analysis.user_id.is_(None))
+
 class FreeAnalysisRequest(BaseModel):
     repository_url: Optional[str] = None
     code_snippet: Optional[str] = None
@@ -56,7 +59,7 @@ class AnalysisResponse(BaseModel):
 async def analyze_free(
     request: FreeAnalysisRequest,
     client_request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Perform free WeReady analysis (no authentication required)
@@ -127,8 +130,8 @@ async def analyze_free(
         )
         
         db.add(analysis)
-        db.commit()
-        db.refresh(analysis)
+        await db.commit()
+        await db.refresh(analysis)
         
         # Create signup prompt based on results
         signup_prompt = create_signup_prompt(result)
@@ -225,8 +228,8 @@ async def analyze_free(
         )
         
         db.add(error_analysis)
-        db.commit()
-        db.refresh(error_analysis)
+        await db.commit()
+        await db.refresh(error_analysis)
         
         raise HTTPException(
             status_code=500, 
@@ -236,7 +239,7 @@ async def analyze_free(
 @router.get("/results/free/{analysis_id}")
 async def get_free_analysis_results(
     analysis_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get results of a free analysis by ID
@@ -248,10 +251,8 @@ async def get_free_analysis_results(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid analysis ID")
     
-    analysis = db.query(Analysis).filter(
-        Analysis.id == analysis_id_int,
-        Analysis.user_id.is_(None)  # Only free analyses
-    ).first()
+    # Only free (unclaimed) analyses
+    analysis = (await db.execute(_FREE_ANALYSIS, {"analysis_id": analysis_id_int})).scalar_one_or_none()
     
     if not analysis:
         raise HTTPException(status_code=404, detail="Analysis not found")
@@ -5,15 +5,19 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import os
 import random
 import re
 import time
+from array import array
+from collections import Counter, deque
+from itertools import chain
 from datetime import datetime, timedelta
-from typing import Any, Dict, Iterable, List, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
+import numpy as np
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
-from fastapi.encoders import jsonable_encoder
 from starlette.responses import StreamingResponse
 
 try:  # Starlette 0.47+ no longer exports EventSourceResponse
@@ -67,23 +71,29 @@ logger = logging.getLogger(__name__)
 
 SOURCE_ID_PATTERN = re.compile(r"^[a-z0-9_.-]+$", re.IGNORECASE)
 
-METRIC_COUNTERS: Dict[str, int] = {
-    "health_requests": 0,
-    "health_failures": 0,
-    "stream_connections": 0,
-    "stream_disconnects": 0,
-    "source_tests": 0,
-    "source_diagnostics": 0,
-    "source_pauses": 0,
-    "source_resumes": 0,
-}
-
-HEALTH_CONCURRENCY = max(1, int(os.getenv("BAILEY_SOURCES_HEALTH_CONCURRENCY", "3")))
-_health_request_semaphore = asyncio.Semaphore(HEALTH_CONCURRENCY)
+METRIC_NAMES: Tuple[str, ...] = (
+    "health_requests",
+    "health_failures",
+    "stream_connections",
+    "stream_disconnects",
+    "source_tests",
+    "source_diagnostics",
+    "source_pauses",
+    "source_resumes",
+)
+_METRIC_SLOTS: Mapping[str, int] = MappingProxyType({name: slot for slot, name in enumerate(METRIC_NAMES)})
+# Fixed-slot int64 counters: increments index a flat array instead of rehashing a dict.
+METRIC_COUNTERS = array("q", bytes(8 * len(METRIC_NAMES)))
+# Names without a fixed slot are still counted on demand, as the old dict-backed counters were.
+_EXTRA_METRICS: Dict[str, int] = {}
 
 
 def _increment_metric(key: str, value: int = 1) -> None:
-    METRIC_COUNTERS[key] = METRIC_COUNTERS.get(key, 0) + value
+    slot = _METRIC_SLOTS.get(key)
+    if slot is None:
+        _EXTRA_METRICS[key] = _EXTRA_METRICS.get(key, 0) + value
+    else:
+        METRIC_COUNTERS[slot] += value
 
 
 def _validate_source_id(source_id: str) -> str:
@@ -100,6 +110,23 @@ def get_service() -> SourceInventoryService:
     return source_inventory_service
 
 
+def _require_known_source(
+    source_id: str, service: SourceInventoryService
+) -> Optional[Dict[str, Any]]:
+    """Validate ``source_id`` and raise 404 unless it is a known source.
+
+    Sources with a baseline are resolved without touching the inventory service.
+    Otherwise the live status snapshot entry is returned for seeding a baseline.
+    """
+    _validate_source_id(source_id)
+    if source_id in SOURCE_BASELINES:
+        return None
+    snapshot_entry = service.get_status_snapshot().get(source_id)
+    if snapshot_entry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Source not found")
+    return snapshot_entry
+
+
 class SourceInventoryItem(BaseModel):
     source_id: str
     name: str
@@ -183,14 +210,14 @@ class SourceHealthPayload(BaseModel):
     error_rate: float = Field(..., alias="errorRate")
     api_quota_remaining: Optional[int] = Field(None, alias="apiQuotaRemaining")
     api_quota_limit: Optional[int] = Field(None, alias="apiQuotaLimit")
-    depends_on: List[str] = Field(default_factory=list, alias="dependsOn")
+    depends_on: Tuple[str, ...] = Field((), alias="dependsOn")
     health_trend: str = Field(..., alias="healthTrend")
     sla_compliance: Optional[str] = Field(None, alias="slaCompliance")
     ingestion_rate: Optional[float] = Field(None, alias="ingestionRate")
     data_points_last_24h: Optional[int] = Field(None, alias="dataPointsLast24h")
     knowledge_points: Optional[int] = Field(None, alias="knowledgePoints")
     maintenance_window: Optional[str] = Field(None, alias="maintenanceWindow")
-    health_history: Optional[List[float]] = Field(None, alias="healthHistory")
+    health_history: Optional[Tuple[float, ...]] = Field(None, alias="healthHistory")
     sunset_date: Optional[datetime] = Field(None, alias="sunsetDate")
     replacement_source: Optional[str] = Field(None, alias="replacementSource")
     migration_guidance: Optional[str] = Field(None, alias="migrationGuidance")
@@ -286,9 +313,30 @@ class DependencyMapResponse(BaseModel):
 
 
 STREAM_REFRESH_SECONDS = 30
+HEALTH_CACHE_TTL_SECONDS = STREAM_REFRESH_SECONDS
+# The stream ticks twice per cache horizon: a rebuilt snapshot goes out in full, and the tick
+# that finds the same snapshot still cached sends a ping instead.
+STREAM_TICK_SECONDS = HEALTH_CACHE_TTL_SECONDS / 2
 _health_cache: Optional[SourceHealthResponse] = None
-_health_cache_timestamp: float = 0.0
-_health_lock = asyncio.Lock()
+# Pre-serialized JSON body of ``_health_cache``; rebuilt together with the snapshot.
+_health_cache_body: bytes = b""
+# Monotonic clock reading of the last build; wall-clock time only feeds ``last_updated``.
+_health_cache_monotonic: float = float("-inf")
+
+
+def _serialize_health_snapshot(snapshot: SourceHealthResponse) -> bytes:
+    return orjson.dumps(snapshot.model_dump(by_alias=True, mode="json"))
+
+
+def _health_snapshot_body(snapshot: SourceHealthResponse) -> bytes:
+    if snapshot is _health_cache:
+        return _health_cache_body
+    return _serialize_health_snapshot(snapshot)
+
+
+def _invalidate_health_cache() -> None:
+    global _health_cache_monotonic
+    _health_cache_monotonic = float("-inf")
 
 
 SOURCE_BASELINES: Dict[str, Dict[str, Any]] = {
@@ -892,6 +940,29 @@ SOURCE_BASELINES: Dict[str, Dict[str, Any]] = {
 }
 
 
+HEALTH_HISTORY_LENGTH = 8
+_EMPTY_TUPLE: Tuple[str, ...] = ()
+_ZERO_HISTORY: Tuple[float, ...] = (0,) * HEALTH_HISTORY_LENGTH
+
+# Baseline sequences are passed straight through to every payload; freeze dependencies
+# once and keep health history in a fixed-size ring buffer so new samples append in O(1).
+for _baseline in SOURCE_BASELINES.values():
+    _baseline["depends_on"] = tuple(_baseline.get("depends_on") or _EMPTY_TUPLE)
+    _baseline["health_history"] = deque(
+        _baseline.get("health_history") or _ZERO_HISTORY, maxlen=HEALTH_HISTORY_LENGTH
+    )
+del _baseline
+
+
+def _record_health_sample(baseline: Dict[str, Any], value: float) -> None:
+    history = baseline.get("health_history")
+    if not isinstance(history, deque):
+        history = baseline["health_history"] = deque(
+            history or _ZERO_HISTORY, maxlen=HEALTH_HISTORY_LENGTH
+        )
+    history.append(value)
+
+
 def _generate_mock_baseline(
     source_id: str,
     *,
@@ -909,15 +980,46 @@ def _generate_mock_baseline(
         "credibility": 75.0,
         "error_rate": 4.5,
         "health_trend": "unknown",
-        "depends_on": [],
+        "depends_on": _EMPTY_TUPLE,
         "sla": "Awaiting baseline data",
         "ingestion_rate": 0,
         "data_points_last_24h": 0,
         "knowledge_points": 0,
-        "health_history": [0, 0, 0, 0, 0, 0, 0, 0],
+        "health_history": _ZERO_HISTORY,
     }
 
 
+_DEFAULT_BASELINE_TEMPLATE: Mapping[str, Any] = MappingProxyType(
+    {
+        "category": "Uncategorized",
+        "uptime": 96.0,
+        "response_time": 420,
+        "credibility": 90.0,
+        "error_rate": 2.0,
+        "health_trend": "stable",
+    }
+)
+
+
+def _make_default_baseline(
+    source_id: str,
+    snapshot_entry: Optional[Dict[str, Any]] = None,
+    **defaults: Any,
+) -> Dict[str, Any]:
+    """Baseline for a source first touched by an operator action.
+
+    ``defaults`` override the shared template; values reported in ``snapshot_entry``
+    take precedence over both.
+    """
+    baseline = dict(_DEFAULT_BASELINE_TEMPLATE)
+    baseline["name"] = source_id
+    baseline.update(defaults)
+    if snapshot_entry:
+        for key in baseline.keys() & snapshot_entry.keys():
+            baseline[key] = snapshot_entry[key]
+    return baseline
+
+
 DEPENDENCY_GRAPH: Dict[str, List[str]] = {
     "sec_edgar": ["federal_reserve"],
     "github_api": ["sonarqube", "codeclimate"],
@@ -930,7 +1032,38 @@ DEPENDENCY_GRAPH: Dict[str, List[str]] = {
 }
 
 
-CONTRADICTION_LOG: List[ContradictionRecord] = [
+class ContradictionLog:
+    """Contradiction records plus the tallies the stats endpoint needs, kept current on append.
+
+    Aggregates live in columns next to the records so building stats never re-walks every
+    record; only resolution timestamps are scanned, because the 24h window moves.
+    """
+
+    def __init__(self, records: Iterable[ContradictionRecord] = ()) -> None:
+        self.records: List[ContradictionRecord] = []
+        self.status_counts: Counter[str] = Counter()
+        self.severity_counts: Counter[str] = Counter()
+        self.resolved_at: List[datetime] = []
+        self.impact_total = 0.0
+        for record in records:
+            self.append(record)
+
+    def append(self, record: ContradictionRecord) -> None:
+        self.records.append(record)
+        self.status_counts[record.status] += 1
+        self.severity_counts[record.severity] += 1
+        if record.resolved_at:
+            self.resolved_at.append(record.resolved_at)
+        self.impact_total += record.impact_score
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[ContradictionRecord]:
+        return iter(self.records)
+
+
+CONTRADICTION_LOG = ContradictionLog([
     ContradictionRecord(
         id="contradiction-1",
         topic="AI Startup Funding Growth Rate",
@@ -981,235 +1114,272 @@ CONTRADICTION_LOG: List[ContradictionRecord] = [
         status="investigating",
         impact_score=64,
     ),
-]
-
-
-STATUS_TO_HEALTH_STATE = {
-    "implemented": "online",
-    "mock": "maintenance",
-    "planned": "offline",
-    "missing": "offline",
-    "sunset": "sunset",
-    "deprecated": "deprecated",
-}
+])
+
+
+STATUS_TO_HEALTH_STATE: Mapping[str, str] = MappingProxyType(
+    {
+        "implemented": "online",
+        "mock": "maintenance",
+        "planned": "offline",
+        "missing": "offline",
+        "sunset": "sunset",
+        "deprecated": "deprecated",
+        # Health states pass through unchanged; listing them keeps the common lookup allocation-free.
+        "online": "online",
+        "degraded": "degraded",
+        "maintenance": "maintenance",
+        "offline": "offline",
+    }
+)
 
 
 def _map_status(status: Optional[str]) -> str:
     if status is None:
         return "offline"
+    mapped = STATUS_TO_HEALTH_STATE.get(status)
+    if mapped is not None:
+        return mapped
     normalized = status.lower()
     return STATUS_TO_HEALTH_STATE.get(normalized, normalized)
 
 
+def _first(key: str, *sources: Optional[Dict[str, Any]], default: Any = None) -> Any:
+    """Return the first truthy ``key`` value across ``sources``, skipping missing dicts."""
+    for source in sources:
+        if source:
+            value = source.get(key)
+            if value:
+                return value
+    return default
+
+
 def _jitter(value: float, magnitude: float = 0.3) -> float:
     return max(0.0, value + random.uniform(-magnitude, magnitude))
 
 
+_history_rng = np.random.default_rng()
+
+
+def _catalog_lookup_for(service: SourceInventoryService) -> Dict[str, Dict[str, Any]]:
+    """Index the frontend catalog by ID; the service rebuilds its index whenever the catalog is reloaded."""
+    lookup = getattr(service, "catalog_lookup", None)
+    if lookup is None:
+        lookup = {entry["id"]: entry for entry in getattr(service, "frontend_catalog", [])}
+    return lookup
+
+
+def _merged_source_ids(*id_groups: Iterable[str]) -> Tuple[str, ...]:
+    """Return the union of ``id_groups`` in first-seen order.
+
+    Consumers key the payload by ``source_id``, so no sort is needed; group order keeps
+    the output deterministic.
+    """
+    return tuple(dict.fromkeys(chain.from_iterable(id_groups)))
+
+
 async def _build_health_snapshot(
     service: SourceInventoryService, *, force_refresh: bool = False
 ) -> SourceHealthResponse:
-    global _health_cache_timestamp, _health_cache
-
-    now = time.time()
-    if (
-        not force_refresh
-        and _health_cache is not None
-        and (now - _health_cache_timestamp) < STREAM_REFRESH_SECONDS - 5
-    ):
-        logger.debug(
-            "Returning cached source health snapshot",
-            extra={"age": now - _health_cache_timestamp},
-        )
-        return _health_cache
+    global _health_cache_monotonic, _health_cache, _health_cache_body
 
-    async with _health_lock:
-        if (
-            not force_refresh
-            and _health_cache is not None
-            and (time.time() - _health_cache_timestamp) < STREAM_REFRESH_SECONDS - 5
-        ):
-            logger.debug("Using cached source health snapshot after lock check")
-            return _health_cache
+    # Lock-free fast path: snapshot both globals once and compare locally.
+    cache = _health_cache
+    age = time.monotonic() - _health_cache_monotonic
+    if not force_refresh and cache is not None and age < HEALTH_CACHE_TTL_SECONDS:
+        logger.debug("Returning cached source health snapshot", extra={"age": age})
+        return cache
 
-        try:
-            snapshot = service.get_status_snapshot()
-        except Exception as exc:  # pragma: no cover - defensive fallback
-            logger.exception("Failed to collect live status snapshot", exc_info=exc)
-            snapshot = {}
-
-        try:
-            sunset_records = {
-                record.source_id: record for record in service.get_sunset_sources()
-            }
-        except Exception as exc:  # pragma: no cover - defensive fallback
-            logger.exception("Unable to collect sunset registry", exc_info=exc)
-            sunset_records = {}
-
-        catalog_entries = getattr(service, "frontend_catalog", [])
-        catalog_lookup = {entry["id"]: entry for entry in catalog_entries}
-        union_ids = (
-            set(snapshot.keys())
-            | set(SOURCE_BASELINES.keys())
-            | set(catalog_lookup.keys())
-        )
+    # The build below never awaits, so it runs to completion before any other request can
+    # observe the stale cache; concurrent misses cannot overlap and need no lock or semaphore.
+    try:
+        snapshot = service.get_status_snapshot()
+    except Exception as exc:  # pragma: no cover - defensive fallback
+        logger.exception("Failed to collect live status snapshot", exc_info=exc)
+        snapshot = {}
 
-        sources_payload: Dict[str, SourceHealthPayload] = {}
+    try:
+        sunset_records = {
+            record.source_id: record for record in service.get_sunset_sources()
+        }
+    except Exception as exc:  # pragma: no cover - defensive fallback
+        logger.exception("Unable to collect sunset registry", exc_info=exc)
+        sunset_records = {}
 
-        for source_id in sorted(union_ids):
-            baseline = SOURCE_BASELINES.get(source_id)
-            catalog_entry = catalog_lookup.get(source_id)
-            if baseline is None:
-                baseline = _generate_mock_baseline(
-                    source_id,
-                    name=catalog_entry.get("name") if catalog_entry else None,
-                    category=catalog_entry.get("category") if catalog_entry else None,
-                )
+    catalog_lookup = _catalog_lookup_for(service)
+    source_ids = _merged_source_ids(SOURCE_BASELINES.keys(), catalog_lookup.keys(), snapshot.keys())
 
-            snapshot_entry = snapshot.get(source_id, {})
-            name = (
-                baseline.get("name")
-                or snapshot_entry.get("name")
-                or (catalog_entry.get("name") if catalog_entry else source_id)
-            )
-            category = (
-                baseline.get("category")
-                or snapshot_entry.get("category")
-                or (catalog_entry.get("category") if catalog_entry else "Uncategorized")
-            )
+    sources_payload: Dict[str, SourceHealthPayload] = {}
+    now_dt = datetime.utcnow()
 
-            status_source: Optional[str] = baseline.get("status") or snapshot_entry.get("status")
-            sunset_record = sunset_records.get(source_id)
-            if status_source is None and sunset_record:
-                status_source = sunset_record.status.value
-            if isinstance(status_source, SourceImplementationStatus):
-                status_source = status_source.value
-            if sunset_record and status_source not in {"sunset", "deprecated"}:
-                status_source = sunset_record.status.value
-            status = _map_status(status_source)
-
-            knowledge_points = snapshot_entry.get("knowledge_points")
-            if knowledge_points is None:
-                knowledge_points = baseline.get("knowledge_points", 0)
-
-            uptime = baseline.get("uptime", 96.5)
-            uptime = min(100.0, _jitter(uptime, 0.4))
-            response_time = int(max(120, _jitter(baseline.get("response_time", 320), 40)))
-            credibility = min(100.0, _jitter(baseline.get("credibility", 92.0), 1.5))
-            error_rate = max(0.0, _jitter(baseline.get("error_rate", 1.2), 0.8))
-
-            baseline_data_points = baseline.get("data_points_last_24h")
-            if baseline_data_points is None and knowledge_points is not None:
-                baseline_data_points = knowledge_points * 4
-            data_points_last_24h = int(max(0, baseline_data_points or 0))
-            ingestion_rate = baseline.get(
-                "ingestion_rate",
-                round(data_points_last_24h / 60, 2) if data_points_last_24h else 0,
-            )
-            api_quota_remaining = baseline.get("api_quota_remaining")
-            api_quota_limit = baseline.get("api_quota_limit")
-            depends_on = baseline.get("depends_on", [])
-            health_trend = baseline.get("health_trend", "stable")
-            sla = baseline.get("sla")
-            maintenance_window = baseline.get("maintenance_window")
-            health_history = baseline.get("health_history")
-
-            sunset_date = baseline.get("sunset_date")
-            if sunset_date is None and sunset_record:
-                sunset_date = sunset_record.sunset_date
-            replacement_source = baseline.get("replacement_source")
-            if replacement_source is None and sunset_record:
-                replacement_source = sunset_record.replacement_source_id
-            migration_guidance = baseline.get("migration_guidance")
-            if migration_guidance is None and sunset_record:
-                migration_guidance = sunset_record.migration_guidance
-            deprecation_notice = baseline.get("deprecation_notice")
-
-            now_dt = datetime.utcnow()
-            payload = SourceHealthPayload(
-                source_id=source_id,
-                name=name,
-                category=category,
-                status=status,
-                uptime=round(uptime, 2),
-                response_time=response_time,
-                credibility=round(credibility, 1),
-                last_update=now_dt - timedelta(seconds=random.randint(20, 600)),
-                data_freshness=now_dt - timedelta(seconds=random.randint(25, 900)),
-                error_rate=round(error_rate, 2),
-                api_quota_remaining=api_quota_remaining,
-                api_quota_limit=api_quota_limit,
-                depends_on=depends_on,
-                health_trend=health_trend,
-                sla_compliance=sla,
-                ingestion_rate=ingestion_rate,
-                data_points_last_24h=data_points_last_24h,
-                knowledge_points=knowledge_points,
-                maintenance_window=maintenance_window,
-                health_history=health_history,
-                sunset_date=sunset_date,
-                replacement_source=replacement_source,
-                migration_guidance=migration_guidance,
-                deprecation_notice=deprecation_notice,
+    for source_id in source_ids:
+        baseline = SOURCE_BASELINES.get(source_id)
+        catalog_entry = catalog_lookup.get(source_id)
+        if baseline is None:
+            baseline = _generate_mock_baseline(
+                source_id,
+                name=catalog_entry.get("name") if catalog_entry else None,
+                category=catalog_entry.get("category") if catalog_entry else None,
             )
-            sources_payload[source_id] = payload
 
-        total_sources = len(sources_payload)
-        active_sources = len(
-            [p for p in sources_payload.values() if p.status not in {"offline", "sunset", "deprecated"}]
-        )
-        average_uptime = (
-            sum(p.uptime for p in sources_payload.values()) / total_sources if total_sources else 0.0
+        snapshot_entry = snapshot.get(source_id)
+        name = _first("name", baseline, snapshot_entry, catalog_entry, default=source_id)
+        category = _first("category", baseline, snapshot_entry, catalog_entry, default="Uncategorized")
+
+        status_source: Optional[str] = _first("status", baseline, snapshot_entry)
+        sunset_record = sunset_records.get(source_id)
+        if status_source is None and sunset_record:
+            status_source = sunset_record.status.value
+        if isinstance(status_source, SourceImplementationStatus):
+            status_source = status_source.value
+        if sunset_record and status_source not in {"sunset", "deprecated"}:
+            status_source = sunset_record.status.value
+        status = _map_status(status_source)
+
+        knowledge_points = snapshot_entry.get("knowledge_points") if snapshot_entry else None
+        if knowledge_points is None:
+            knowledge_points = baseline.get("knowledge_points", 0)
+
+        uptime = baseline.get("uptime", 96.5)
+        uptime = min(100.0, _jitter(uptime, 0.4))
+        response_time = int(max(120, _jitter(baseline.get("response_time", 320), 40)))
+        credibility = min(100.0, _jitter(baseline.get("credibility", 92.0), 1.5))
+        error_rate = max(0.0, _jitter(baseline.get("error_rate", 1.2), 0.8))
+
+        baseline_data_points = baseline.get("data_points_last_24h")
+        if baseline_data_points is None and knowledge_points is not None:
+            baseline_data_points = knowledge_points * 4
+        data_points_last_24h = int(max(0, baseline_data_points or 0))
+        ingestion_rate = baseline.get(
+            "ingestion_rate",
+            round(data_points_last_24h / 60, 2) if data_points_last_24h else 0,
         )
-        average_response_time = (
-            sum(p.response_time for p in sources_payload.values()) / total_sources if total_sources else 0.0
-        )
-        total_data_points = sum(p.data_points_last_24h or 0 for p in sources_payload.values())
-        total_knowledge_points = sum(p.knowledge_points or 0 for p in sources_payload.values())
-        average_credibility = (
-            sum(p.credibility for p in sources_payload.values()) / total_sources if total_sources else 0.0
+        api_quota_remaining = baseline.get("api_quota_remaining")
+        api_quota_limit = baseline.get("api_quota_limit")
+        depends_on = baseline.get("depends_on", _EMPTY_TUPLE)
+        health_trend = baseline.get("health_trend", "stable")
+        sla = baseline.get("sla")
+        maintenance_window = baseline.get("maintenance_window")
+        health_history = baseline.get("health_history")
+        if health_history is not None:
+            health_history = tuple(health_history)
+
+        sunset_date = baseline.get("sunset_date")
+        if sunset_date is None and sunset_record:
+            sunset_date = sunset_record.sunset_date
+        replacement_source = baseline.get("replacement_source")
+        if replacement_source is None and sunset_record:
+            replacement_source = sunset_record.replacement_source_id
+        migration_guidance = baseline.get("migration_guidance")
+        if migration_guidance is None and sunset_record:
+            migration_guidance = sunset_record.migration_guidance
+        deprecation_notice = baseline.get("deprecation_notice")
+
+        # Values are produced and clamped above, so skip per-field validation.
+        payload = SourceHealthPayload.model_construct(
+            source_id=source_id,
+            name=name,
+            category=category,
+            status=status,
+            uptime=round(uptime, 2),
+            response_time=response_time,
+            credibility=round(credibility, 1),
+            last_update=now_dt - timedelta(seconds=random.randint(20, 600)),
+            data_freshness=now_dt - timedelta(seconds=random.randint(25, 900)),
+            error_rate=round(error_rate, 2),
+            api_quota_remaining=api_quota_remaining,
+            api_quota_limit=api_quota_limit,
+            depends_on=depends_on,
+            health_trend=health_trend,
+            sla_compliance=sla,
+            ingestion_rate=ingestion_rate,
+            data_points_last_24h=data_points_last_24h,
+            knowledge_points=knowledge_points,
+            maintenance_window=maintenance_window,
+            health_history=health_history,
+            sunset_date=sunset_date,
+            replacement_source=replacement_source,
+            migration_guidance=migration_guidance,
+            deprecation_notice=deprecation_notice,
         )
+        sources_payload[source_id] = payload
 
-        health_score = min(
-            100.0,
-            round(
-                (average_uptime * 0.45)
-                + (average_credibility * 0.4)
-                + ((active_sources / max(total_sources, 1)) * 100 * 0.15),
-                2,
-            ),
-        )
+    total_sources = len(sources_payload)
+    active_sources = len(
+        [p for p in sources_payload.values() if p.status not in {"offline", "sunset", "deprecated"}]
+    )
+    average_uptime = (
+        sum(p.uptime for p in sources_payload.values()) / total_sources if total_sources else 0.0
+    )
+    average_response_time = (
+        sum(p.response_time for p in sources_payload.values()) / total_sources if total_sources else 0.0
+    )
+    total_data_points = sum(p.data_points_last_24h or 0 for p in sources_payload.values())
+    total_knowledge_points = sum(p.knowledge_points or 0 for p in sources_payload.values())
+    average_credibility = (
+        sum(p.credibility for p in sources_payload.values()) / total_sources if total_sources else 0.0
+    )
 
-        metrics = AggregatedHealthMetrics(
-            total_sources=total_sources,
-            active_sources=active_sources,
-            average_uptime=round(average_uptime, 2),
-            average_response_time=round(average_response_time, 2),
-            total_data_points=total_data_points,
-            system_health_score=health_score,
-            last_updated=datetime.utcnow(),
-            refresh_interval_seconds=STREAM_REFRESH_SECONDS,
-            total_knowledge_points=total_knowledge_points,
-            average_credibility=round(average_credibility, 2),
-            sla_target_ms=400,
-        )
+    health_score = min(
+        100.0,
+        round(
+            (average_uptime * 0.45)
+            + (average_credibility * 0.4)
+            + ((active_sources / max(total_sources, 1)) * 100 * 0.15),
+            2,
+        ),
+    )
 
-        response = SourceHealthResponse(
-            sources=sources_payload,
-            metrics=metrics,
-            last_updated=datetime.utcnow(),
-        )
+    metrics = AggregatedHealthMetrics.model_construct(
+        total_sources=total_sources,
+        active_sources=active_sources,
+        average_uptime=round(average_uptime, 2),
+        average_response_time=round(average_response_time, 2),
+        total_data_points=total_data_points,
+        system_health_score=health_score,
+        last_updated=now_dt,
+        refresh_interval_seconds=STREAM_REFRESH_SECONDS,
+        total_knowledge_points=total_knowledge_points,
+        average_credibility=round(average_credibility, 2),
+        sla_target_ms=400,
+    )
+
+    response = SourceHealthResponse.model_construct(
+        sources=sources_payload,
+        metrics=metrics,
+        last_updated=now_dt,
+    )
+
+    _health_cache_body = _serialize_health_snapshot(response)
+    _health_cache = response
+    _health_cache_monotonic = time.monotonic()
+    logger.info(
+        "Generated new source health snapshot",
+        extra={
+            "total_sources": metrics.total_sources,
+            "active_sources": metrics.active_sources,
+            "health_score": metrics.system_health_score,
+        },
+    )
+    return response
 
-        _health_cache = response
-        _health_cache_timestamp = time.time()
-        logger.info(
-            "Generated new source health snapshot",
-            extra={
-                "total_sources": metrics.total_sources,
-                "active_sources": metrics.active_sources,
-                "health_score": metrics.system_health_score,
-            },
-        )
-        return response
+
+CONTRADICTIONS_CACHE_TTL_SECONDS = 30
+DEPENDENCIES_CACHE_TTL_SECONDS = 300
+# Slow-moving aggregate responses keyed by endpoint: (built_at_monotonic, version, value)
+_response_cache: Dict[str, Tuple[float, Any, Any]] = {}
+
+
+def _cached_response(key: str, ttl: float, builder: Callable[[], Any], version: Any = None) -> Any:
+    """Return the cached value for ``key`` while it is younger than ``ttl`` and ``version`` matches."""
+    now = time.monotonic()
+    entry = _response_cache.get(key)
+    if entry is not None and now - entry[0] < ttl and entry[1] == version:
+        return entry[2]
+
+    value = builder()
+    _response_cache[key] = (now, version, value)
+    return value
 
 
 def _build_dependency_map() -> DependencyMapResponse:
@@ -1241,19 +1411,19 @@ def _build_dependency_map() -> DependencyMapResponse:
     return DependencyMapResponse(nodes=nodes, critical_paths=critical_paths)
 
 
-def _build_contradiction_stats(records: Iterable[ContradictionRecord]) -> ContradictionStatsModel:
-    records_list = list(records)
-    total = len(records_list)
-    active = len([r for r in records_list if r.status in {"active", "investigating"}])
-    resolved = len([r for r in records_list if r.status == "resolved"])
-    acceptable = len([r for r in records_list if r.status == "acceptable"])
-    high_severity = len([r for r in records_list if r.severity in {"high", "critical"}])
-
+def _build_contradiction_stats(log: ContradictionLog) -> ContradictionStatsModel:
     median_resolution = "2h"
-    last_24h = len([r for r in records_list if r.resolved_at and (datetime.utcnow() - r.resolved_at) < timedelta(hours=24)])
-    average_impact = (
-        sum(r.impact_score for r in records_list) / total if total else 0.0
-    )
+    now = datetime.utcnow()
+    cutoff = now - timedelta(hours=24)
+
+    total = len(log)
+    status_counts = log.status_counts
+    active = status_counts["active"] + status_counts["investigating"]
+    resolved = status_counts["resolved"]
+    acceptable = status_counts["acceptable"]
+    high_severity = log.severity_counts["high"] + log.severity_counts["critical"]
+    last_24h = sum(1 for resolved_at in log.resolved_at if resolved_at > cutoff)
+    average_impact = log.impact_total / total if total else 0.0
 
     return ContradictionStatsModel(
         total=total,
@@ -1264,7 +1434,7 @@ def _build_contradiction_stats(records: Iterable[ContradictionRecord]) -> Contra
         median_resolution_time=median_resolution,
         resolutions_last_24h=last_24h,
         average_credibility_impact=round(average_impact / 10, 2),
-        last_checked=datetime.utcnow(),
+        last_checked=now,
     )
 
 @router.get("/inventory", response_model=List[SourceInventoryItem])
@@ -1310,8 +1480,7 @@ async def get_status(
         logger.exception("Status snapshot lookup failed", exc_info=exc)
         snapshot = {}
 
-    catalog_entries = getattr(service, "frontend_catalog", [])
-    catalog_lookup = {entry["id"]: entry for entry in catalog_entries}
+    catalog_lookup = _catalog_lookup_for(service)
     inventory_lookup = {record.source_id: record for record in raw_inventory}
 
     union_ids = (
@@ -1439,15 +1608,13 @@ async def get_all_sources(
 @router.get("/health", response_model=SourceHealthResponse)
 async def get_source_health(
     request: Request,
-    response: Response,
     force: bool = Query(False, description="Force regeneration of health snapshot"),
     service: SourceInventoryService = Depends(get_service),
-) -> Dict[str, Any]:
+) -> Response:
     start = time.perf_counter()
     _increment_metric("health_requests")
     try:
-        async with _health_request_semaphore:
-            snapshot = await _build_health_snapshot(service, force_refresh=force)
+        snapshot = await _build_health_snapshot(service, force_refresh=force)
     except HTTPException:
         _increment_metric("health_failures")
         raise
@@ -1459,11 +1626,9 @@ async def get_source_health(
             detail="Unable to build source health snapshot.",
         ) from exc
 
+    body = _health_snapshot_body(snapshot)
     latency_ms = (time.perf_counter() - start) * 1000
-    response.headers["X-Bailey-Health-Latency"] = f"{latency_ms:.2f}"
-    response.headers["Cache-Control"] = f"public, max-age={STREAM_REFRESH_SECONDS}"
     cache_status = "miss" if force else ("hit" if snapshot is _health_cache else "miss")
-    response.headers["X-Bailey-Health-Cache"] = cache_status
 
     logger.info(
         "Served source health snapshot",
@@ -1474,7 +1639,16 @@ async def get_source_health(
         },
     )
 
-    return jsonable_encoder(snapshot, by_alias=True)
+    # Serve the cached bytes directly instead of re-encoding the model on every request.
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={
+            "X-Bailey-Health-Latency": f"{latency_ms:.2f}",
+            "Cache-Control": f"public, max-age={STREAM_REFRESH_SECONDS}",
+            "X-Bailey-Health-Cache": cache_status,
+        },
+    )
 
 
 @router.get("/status/stream")
@@ -1487,15 +1661,20 @@ async def stream_source_health(
     logger.info("Source health stream connected", extra={"client": client_host})
 
     async def event_generator():
+        last_sent_at: Optional[datetime] = None
         try:
             while True:
                 snapshot = await _build_health_snapshot(service)
-                payload = jsonable_encoder(snapshot, by_alias=True)
-                yield {
-                    "event": "message",
-                    "data": json.dumps(payload, default=str),
-                }
-                await asyncio.sleep(STREAM_REFRESH_SECONDS)
+                if snapshot.last_updated == last_sent_at:
+                    # Same build as the last tick; keep the connection alive cheaply.
+                    yield {"event": "ping", "data": ""}
+                else:
+                    yield {
+                        "event": "message",
+                        "data": _health_snapshot_body(snapshot).decode("utf-8"),
+                    }
+                    last_sent_at = snapshot.last_updated
+                await asyncio.sleep(STREAM_TICK_SECONDS)
         except asyncio.CancelledError:  # pragma: no cover - stream cancelled by client
             logger.debug("Source health stream cancelled by client", extra={"client": client_host})
             raise
@@ -1514,33 +1693,22 @@ async def trigger_source_test(
     source_id: str,
     service: SourceInventoryService = Depends(get_service),
 ) -> SourceTestResult:
-    _validate_source_id(source_id)
-    snapshot = service.get_status_snapshot()
-    if source_id not in SOURCE_BASELINES and source_id not in snapshot:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Source not found")
+    _require_known_source(source_id, service)
 
     latency = random.randint(120, 1200)
-    baseline = SOURCE_BASELINES.setdefault(
-        source_id,
-        {
-            "name": source_id,
-            "category": "Uncategorized",
-            "status": "online",
-            "uptime": 96.0,
-            "response_time": latency,
-            "credibility": 90.0,
-            "error_rate": 2.0,
-            "health_trend": "stable",
-        },
-    )
+    baseline = SOURCE_BASELINES.get(source_id)
+    if baseline is None:
+        # A first test has always reported against the template defaults; only pause and
+        # resume seed from the live snapshot
+        baseline = SOURCE_BASELINES[source_id] = _make_default_baseline(source_id, status="online")
     baseline["response_time"] = latency
     baseline["uptime"] = min(100.0, baseline.get("uptime", 96.0) + random.uniform(0.1, 0.3))
     baseline["error_rate"] = max(0.0, baseline.get("error_rate", 1.0) - random.uniform(0.1, 0.3))
     baseline["status"] = "online"
+    _record_health_sample(baseline, round(baseline["uptime"], 1))
 
     # Invalidate cache so the next fetch sees fresh metrics
-    global _health_cache_timestamp
-    _health_cache_timestamp = 0
+    _invalidate_health_cache()
 
     _increment_metric("source_tests")
     logger.info(
@@ -1562,10 +1730,7 @@ async def run_source_diagnostics(
     source_id: str,
     service: SourceInventoryService = Depends(get_service),
 ) -> SourceTestResult:
-    _validate_source_id(source_id)
-    snapshot = service.get_status_snapshot()
-    if source_id not in SOURCE_BASELINES and source_id not in snapshot:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Source not found")
+    _require_known_source(source_id, service)
 
     latency = random.randint(150, 1400)
     success = latency < 1200
@@ -1574,8 +1739,7 @@ async def run_source_diagnostics(
         SOURCE_BASELINES[source_id]["status"] = "online" if success else "degraded"
         SOURCE_BASELINES[source_id]["response_time"] = latency
 
-    global _health_cache_timestamp
-    _health_cache_timestamp = 0
+    _invalidate_health_cache()
 
     _increment_metric("source_diagnostics")
     logger.info(
@@ -1597,28 +1761,16 @@ async def pause_source_monitoring(
     source_id: str,
     service: SourceInventoryService = Depends(get_service),
 ) -> Response:
-    _validate_source_id(source_id)
-    snapshot = service.get_status_snapshot()
-    if source_id not in SOURCE_BASELINES and source_id not in snapshot:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Source not found")
+    snapshot_entry = _require_known_source(source_id, service)
 
-    source_snapshot = snapshot.get(source_id, {})
-    baseline = SOURCE_BASELINES.setdefault(
-        source_id,
-        {
-            "name": source_snapshot.get("name", source_id),
-            "category": source_snapshot.get("category", "Uncategorized"),
-            "uptime": source_snapshot.get("uptime", 95.0),
-            "response_time": source_snapshot.get("response_time", 500),
-            "credibility": source_snapshot.get("credibility", 90.0),
-            "error_rate": source_snapshot.get("error_rate", 2.0),
-            "health_trend": source_snapshot.get("health_trend", "stable"),
-        },
-    )
+    baseline = SOURCE_BASELINES.get(source_id)
+    if baseline is None:
+        baseline = SOURCE_BASELINES[source_id] = _make_default_baseline(
+            source_id, snapshot_entry, uptime=95.0, response_time=500
+        )
     baseline["status"] = "maintenance"
     baseline["maintenance_window"] = "Paused by operator"
-    global _health_cache_timestamp
-    _health_cache_timestamp = 0
+    _invalidate_health_cache()
     _increment_metric("source_pauses")
     logger.info("Source monitoring paused", extra={"source_id": source_id})
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1629,27 +1781,13 @@ async def resume_source_monitoring(
     source_id: str,
     service: SourceInventoryService = Depends(get_service),
 ) -> Response:
-    _validate_source_id(source_id)
-    snapshot = service.get_status_snapshot()
-    if source_id not in SOURCE_BASELINES and source_id not in snapshot:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Source not found")
-    source_snapshot = snapshot.get(source_id, {})
-    baseline = SOURCE_BASELINES.setdefault(
-        source_id,
-        {
-            "name": source_snapshot.get("name", source_id),
-            "category": source_snapshot.get("category", "Uncategorized"),
-            "uptime": source_snapshot.get("uptime", 96.0),
-            "response_time": source_snapshot.get("response_time", 420),
-            "credibility": source_snapshot.get("credibility", 90.0),
-            "error_rate": source_snapshot.get("error_rate", 2.0),
-            "health_trend": source_snapshot.get("health_trend", "stable"),
-        },
-    )
+    snapshot_entry = _require_known_source(source_id, service)
+    baseline = SOURCE_BASELINES.get(source_id)
+    if baseline is None:
+        baseline = SOURCE_BASELINES[source_id] = _make_default_baseline(source_id, snapshot_entry)
     baseline["status"] = "online"
     baseline.pop("maintenance_window", None)
-    global _health_cache_timestamp
-    _health_cache_timestamp = 0
+    _invalidate_health_cache()
     _increment_metric("source_resumes")
     logger.info("Source monitoring resumed", extra={"source_id": source_id})
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1661,27 +1799,38 @@ async def get_source_history(
     window: str = "24h",
     service: SourceInventoryService = Depends(get_service),
 ) -> SourceHistoryResponse:
-    _validate_source_id(source_id)
-    if source_id not in SOURCE_BASELINES and source_id not in service.get_status_snapshot():
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Source not found")
+    _require_known_source(source_id, service)
 
     hours = 24 if window == "24h" else 1
     now = datetime.utcnow()
-    datapoints: List[SourceHistoryPoint] = []
     baseline = SOURCE_BASELINES.get(source_id, {})
-    for index in range(hours * 4):
-        timestamp = now - timedelta(minutes=15 * index)
-        datapoints.append(
-            SourceHistoryPoint(
-                timestamp=timestamp,
-                uptime=max(80.0, _jitter(baseline.get("uptime", 96.0), 1.5)),
-                response_time=int(max(100, _jitter(baseline.get("response_time", 320), 45))),
-                error_rate=max(0.0, _jitter(baseline.get("error_rate", 1.2), 0.6)),
-                knowledge_points=int(max(0, baseline.get("knowledge_points", 1000) + random.randint(-20, 40))),
-            )
-        )
 
-    datapoints.sort(key=lambda item: item.timestamp)
+    # Draw every jittered series in one vectorized pass instead of per-datapoint random calls.
+    count = hours * 4
+    uptimes = np.maximum(80.0, baseline.get("uptime", 96.0) + _history_rng.uniform(-1.5, 1.5, count))
+    response_times = np.maximum(
+        100, baseline.get("response_time", 320) + _history_rng.uniform(-45, 45, count)
+    ).astype(np.int64)
+    error_rates = np.maximum(0.0, baseline.get("error_rate", 1.2) + _history_rng.uniform(-0.6, 0.6, count))
+    knowledge_points = np.maximum(
+        0, baseline.get("knowledge_points", 1000) + _history_rng.integers(-20, 41, count)
+    )
+
+    # Walk the window oldest-first so datapoints come out sorted without a sort pass.
+    step = timedelta(minutes=15)
+    start = now - step * (count - 1)
+    datapoints: List[SourceHistoryPoint] = [
+        SourceHistoryPoint(
+            timestamp=start + step * index,
+            uptime=uptime,
+            response_time=response_time,
+            error_rate=error_rate,
+            knowledge_points=knowledge,
+        )
+        for index, (uptime, response_time, error_rate, knowledge) in enumerate(
+            zip(uptimes.tolist(), response_times.tolist(), error_rates.tolist(), knowledge_points.tolist())
+        )
+    ]
 
     return SourceHistoryResponse(
         source_id=source_id,
@@ -1691,22 +1840,35 @@ async def get_source_history(
 
 
 @router.get("/metrics/runtime", response_model=Dict[str, int])
-async def get_runtime_metrics() -> Dict[str, int]:
+async def get_runtime_metrics() -> Response:
     """Expose lightweight runtime counters for observability dashboards."""
-    return dict(METRIC_COUNTERS)
+    return Response(
+        content=orjson.dumps({**dict(zip(METRIC_NAMES, METRIC_COUNTERS)), **_EXTRA_METRICS}),
+        media_type="application/json",
+    )
 
 
 @router.get("/contradictions", response_model=ContradictionResponse)
-async def get_contradictions() -> Dict[str, Any]:
-    stats = _build_contradiction_stats(CONTRADICTION_LOG)
-    response = ContradictionResponse(
-        contradictions=CONTRADICTION_LOG,
-        stats=stats,
-        last_checked=datetime.utcnow(),
+async def get_contradictions() -> Response:
+    def build() -> bytes:
+        stats = _build_contradiction_stats(CONTRADICTION_LOG)
+        response = ContradictionResponse(
+            contradictions=CONTRADICTION_LOG.records,
+            stats=stats,
+            last_checked=datetime.utcnow(),
+        )
+        # One orjson pass over the JSON-mode dump instead of jsonable_encoder plus FastAPI's encoder.
+        return orjson.dumps(response.model_dump(mode="json"))
+
+    body = _cached_response(
+        "contradictions", CONTRADICTIONS_CACHE_TTL_SECONDS, build, version=len(CONTRADICTION_LOG)
     )
-    return jsonable_encoder(response)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/dependencies", response_model=DependencyMapResponse)
 async def get_dependency_map() -> DependencyMapResponse:
-    return _build_dependency_map()
+    # Baselines are only ever added, so their count is enough to detect new graph nodes.
+    return _cached_response(
+        "dependencies", DEPENDENCIES_CACHE_TTL_SECONDS, _build_dependency_map, version=len(SOURCE_BASELINES)
+    )
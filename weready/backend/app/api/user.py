@@ -4,16 +4,16 @@ User API Routes
 Handle user-specific operations like analysis history, progress tracking, etc.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, desc
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 
-from app.database.connection import get_db
-from app.models.user import User
-from app.auth.jwt_handler import get_current_user
+from app.database.connection import get_async_db
+from app.models.user import UserSnapshot
+from app.auth.jwt_handler import get_current_user, get_current_user_claims
 
 router = APIRouter()
 
@@ -45,10 +45,15 @@ class ProgressMetrics(BaseModel):
     improvement_velocity: float  # points per week
     achievements: List[str]
 
+# Endpoints emit the model's JSON bytes directly instead of going through FastAPI's
+# response_model validation and jsonable_encoder on every request.
+def _json_response(payload: BaseModel) -> Response:
+    return Response(content=payload.model_dump_json(), media_type="application/json")
+
 @router.get("/user/analyses/summary", response_model=AnalysisSummaryResponse)
 async def get_user_analyses_summary(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    claims: Dict[str, Any] = Depends(get_current_user_claims),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get summary of user's analysis history for dashboard"""
     
@@ -57,67 +62,68 @@ async def get_user_analyses_summary(
     
     # Check if user has any analyses (mock check for now)
     # In real implementation: 
-    # analyses = db.query(Analysis).filter(Analysis.user_id == current_user.id).all()
+    # analyses = (await db.execute(select(Analysis).where(Analysis.user_id == claims["user_id"]))).scalars().all()
     
     # Mock data for demo purposes
     # TODO: Replace with real analysis data from database
     
-    return AnalysisSummaryResponse(
+    return _json_response(AnalysisSummaryResponse(
         total_analyses=0,
         last_analysis_date=None,
         average_score=None,
         score_trend=None,
         latest_score=None
-    )
+    ))
 
 @router.get("/user/analyses/history", response_model=AnalysisHistoryResponse)
 async def get_user_analyses_history(
     page: int = 1,
     limit: int = 10,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    claims: Dict[str, Any] = Depends(get_current_user_claims),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get paginated analysis history for user"""
     
     offset = (page - 1) * limit
     
     # Mock implementation - in real app would query Analysis table
-    # analyses = db.query(Analysis).filter(
-    #     Analysis.user_id == current_user.id
-    # ).order_by(desc(Analysis.created_at)).offset(offset).limit(limit).all()
+    # analyses = (await db.execute(
+    #     select(Analysis).where(Analysis.user_id == claims["user_id"])
+    #     .order_by(desc(Analysis.created_at)).offset(offset).limit(limit)
+    # )).scalars().all()
     
     # For now return empty list since we don't have analyses integrated yet
-    return AnalysisHistoryResponse(
+    return _json_response(AnalysisHistoryResponse(
         analyses=[],
         total_count=0,
         has_more=False
-    )
+    ))
 
 @router.get("/user/progress", response_model=ProgressMetrics)
 async def get_user_progress_metrics(
     timeframe: str = "all",  # "week", "month", "quarter", "all"
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    claims: Dict[str, Any] = Depends(get_current_user_claims),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get detailed progress metrics for user"""
     
     # Mock implementation - would calculate real metrics from analysis history
-    return ProgressMetrics(
+    return _json_response(ProgressMetrics(
         overall_score_progression=[],
         pillar_scores_progression=[],
         issues_resolved_count=0,
         total_issues_found=0,
         improvement_velocity=0.0,
         achievements=[]
-    )
+    ))
 
 # Additional endpoints for future use
 
 @router.post("/user/analyses/{analysis_id}/link")
 async def link_analysis_to_user(
     analysis_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Link an anonymous analysis to the current user"""
     
@@ -132,8 +138,8 @@ async def link_analysis_to_user(
 async def compare_analyses(
     analysis_id_1: str,
     analysis_id_2: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    claims: Dict[str, Any] = Depends(get_current_user_claims),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Compare two analyses to show progress"""
     
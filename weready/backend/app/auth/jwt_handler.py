@@ -5,17 +5,27 @@ Handles JWT token creation, validation, and refresh for WeReady authentication.
 """
 
 import os
-import jwt
+import base64
+import hashlib
+import heapq
+import hmac
+import logging
+import orjson
+import threading
+import time
+from calendar import timegm
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Hashable, Tuple
 from dotenv import load_dotenv
-from jose import JWTError
+from authlib.jose import JoseError, JsonWebKey, JsonWebToken
 import secrets
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database.connection import get_db
-from app.models.user import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.connection import get_async_db
+from app.models.user import User, UserSnapshot
 
 load_dotenv()
 
@@ -24,6 +34,278 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY", "fallback-secret-key-change-in-producti
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("JWT_VERIFY_CACHE_TTL_SECONDS", "60"))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("JWT_VERIFY_CACHE_MAX_ENTRIES", "10000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_USER_CACHE_MAX_ENTRIES", "5000"))
+REVOKED_TOKEN_MAX_ENTRIES = int(os.getenv("JWT_REVOKED_TOKEN_MAX_ENTRIES", "100000"))
+
+# Derived once at import instead of on every token operation
+_SECRET_KEY_BYTES = SECRET_KEY.encode()
+_ACCESS_TOKEN_LIFETIME_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_REFRESH_TOKEN_LIFETIME_SECONDS = REFRESH_TOKEN_EXPIRE_DAYS * 86400
+# Fields shared by every token-pair response; read-only so callers can't alter it for others
+_TOKEN_PAIR_TEMPLATE = MappingProxyType({
+    "token_type": "bearer",
+    "expires_in": _ACCESS_TOKEN_LIFETIME_SECONDS
+})
+
+_MISSING = object()
+
+# Every token this module issues carries these; anything without them is rejected at decode
+_REQUIRED_CLAIMS = frozenset({"exp", "user_id"})
+_JOSE_CLAIMS_OPTIONS = {claim: {"essential": True} for claim in _REQUIRED_CLAIMS}
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed time-to-live"""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        if lifetime <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + lifetime, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RevocationStoreFull(Exception):
+    """Raised when the in-memory deny-list cannot record another revocation"""
+
+
+class RevocationSet:
+    """
+    Thread-safe deny-list whose entries leave only when they expire.
+    
+    Unlike TTLCache it never evicts a live entry to make room: once ``maxsize`` unexpired
+    entries are held, ``add`` raises RevocationStoreFull so the caller can refuse the
+    revocation instead of silently un-revoking an older token.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._expiries: Dict[Hashable, float] = {}
+        # (expires_at, key) min-heap; stale pairs left by re-adds are skipped when purging
+        self._heap: list = []
+        self._lock = threading.Lock()
+
+    def _purge(self, now: float) -> None:
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            if self._expiries.get(key) == expires_at:
+                del self._expiries[key]
+
+    def add(self, key: Hashable, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        now = time.monotonic()
+        expires_at = now + ttl
+        with self._lock:
+            self._purge(now)
+            current = self._expiries.get(key)
+            if current is None and len(self._expiries) >= self.maxsize:
+                raise RevocationStoreFull(f"revocation store holds {self.maxsize} live entries")
+            if current is None or current < expires_at:
+                self._expiries[key] = expires_at
+                heapq.heappush(self._heap, (expires_at, key))
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            expires_at = self._expiries.get(key)
+            return expires_at is not None and expires_at > time.monotonic()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge(time.monotonic())
+            return len(self._expiries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expiries.clear()
+            self._heap.clear()
+
+
+# Decoded payloads (or None for rejected tokens) keyed by the token's SHA-256 digest
+_token_cache = TTLCache(TOKEN_CACHE_MAX_ENTRIES, TOKEN_CACHE_TTL_SECONDS)
+# Immutable UserSnapshot copies keyed by id; no ORM instance outlives the session that loaded it
+_user_cache = TTLCache(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS)
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+# Revoked refresh-token jtis live until the token would have expired anyway. Redis shares the
+# set across workers when REDIS_URL is configured; otherwise each process keeps its own, and
+# revocations are refused once JWT_REVOKED_TOKEN_MAX_ENTRIES live entries are held.
+_revoked_jtis = RevocationSet(REVOKED_TOKEN_MAX_ENTRIES)
+# Digests of access tokens presented at logout; consulted only when the verification cache misses
+_logged_out_tokens = RevocationSet(REVOKED_TOKEN_MAX_ENTRIES)
+_revocation_redis = None
+_redis_url = os.getenv("REDIS_URL")
+if _redis_url:
+    try:
+        import redis.asyncio as redis_asyncio
+        _revocation_redis = redis_asyncio.Redis.from_url(_redis_url)
+    except Exception as exc:
+        logging.warning(f"Redis unavailable ({exc}); tracking revoked tokens in memory")
+        _revocation_redis = None
+
+
+def _revocation_key(jti: str) -> str:
+    return f"revoked:{jti}"
+
+
+# HS256 fast path: the header never changes, so encode it once and sign with hmac directly
+_HS256_HEADER_B64 = base64.urlsafe_b64encode(orjson.dumps({"alg": "HS256", "typ": "JWT"})).rstrip(b"=")
+# Keyed HMAC template; copying it per token skips re-deriving the key pads
+_HS256_MAC = hmac.new(_SECRET_KEY_BYTES, digestmod=hashlib.sha256)
+
+
+# Other algorithms go through Authlib's JOSE implementation (cryptography-backed),
+# restricted to the configured algorithm to rule out algorithm confusion
+_jose_jwt = JsonWebToken([ALGORITHM])
+
+
+def _read_key_file(env_name: str) -> Optional[bytes]:
+    path = os.getenv(env_name)
+    if not path:
+        return None
+    with open(path, "rb") as key_file:
+        return key_file.read()
+
+
+def _load_asymmetric_keys(algorithm: str) -> Tuple[Any, Any]:
+    """
+    Parse the signing and verification keys for an asymmetric algorithm.
+    
+    Both PEM files are required: a key generated per process would make tokens signed by one
+    worker fail on the others and after every restart, so misconfiguration fails at startup.
+    """
+    pems = {}
+    for env_name in ("JWT_PRIVATE_KEY_PATH", "JWT_PUBLIC_KEY_PATH"):
+        pem = _read_key_file(env_name)
+        if pem is None:
+            raise RuntimeError(f"JWT_ALGORITHM={algorithm} requires a PEM key file in {env_name}")
+        pems[env_name] = pem
+    try:
+        return (
+            JsonWebKey.import_key(pems["JWT_PRIVATE_KEY_PATH"]),
+            JsonWebKey.import_key(pems["JWT_PUBLIC_KEY_PATH"]),
+        )
+    except Exception as exc:
+        raise RuntimeError(f"JWT_ALGORITHM={algorithm}: could not parse the configured PEM key files ({exc})") from exc
+
+
+# Keys are parsed once here rather than on every encode/decode. HMAC algorithms use
+# JWT_SECRET_KEY; asymmetric ones (EdDSA, RS256, ES256, ...) need both PEM key files.
+if ALGORITHM == "HS256":
+    _JOSE_SIGNING_KEY = _JOSE_VERIFY_KEY = None
+elif ALGORITHM.startswith("HS"):
+    _JOSE_SIGNING_KEY = _JOSE_VERIFY_KEY = JsonWebKey.import_key(_SECRET_KEY_BYTES, {"kty": "oct"})
+else:
+    _JOSE_SIGNING_KEY, _JOSE_VERIFY_KEY = _load_asymmetric_keys(ALGORITHM)
+
+
+def _hs256_sign(signing_input: bytes) -> bytes:
+    mac = _HS256_MAC.copy()
+    mac.update(signing_input)
+    return mac.digest()
+
+
+def _b64url_encode(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+
+def _b64url_decode(segment: bytes) -> bytes:
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+
+def _claim_default(value: Any) -> Any:
+    """Serialize datetime claims as NumericDate, matching PyJWT"""
+    if isinstance(value, datetime):
+        return timegm(value.utctimetuple())
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _encode_hs256(claims: Dict[str, Any]) -> str:
+    payload = orjson.dumps(claims, default=_claim_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    signing_input = _HS256_HEADER_B64 + b"." + _b64url_encode(payload)
+    signature = _hs256_sign(signing_input)
+    return (signing_input + b"." + _b64url_encode(signature)).decode("ascii")
+
+
+def _decode_hs256(token: str) -> Optional[Dict[str, Any]]:
+    """Verify an HS256 token's signature and time claims; None if anything is off"""
+    try:
+        signing_input, _, signature_b64 = token.encode("ascii").rpartition(b".")
+        header_b64, _, payload_b64 = signing_input.partition(b".")
+        # Our own tokens carry the canonical header bytes; only parse headers we didn't write
+        if header_b64 != _HS256_HEADER_B64:
+            header = orjson.loads(_b64url_decode(header_b64))
+            if not isinstance(header, dict) or header.get("alg") != "HS256":
+                return None
+        expected = _hs256_sign(signing_input)
+        if not hmac.compare_digest(expected, _b64url_decode(signature_b64)):
+            return None
+        payload = orjson.loads(_b64url_decode(payload_b64))
+    except ValueError:  # bad ASCII, base64 or JSON
+        return None
+    
+    if not isinstance(payload, dict) or not _REQUIRED_CLAIMS.issubset(payload):
+        return None
+    
+    now = time.time()
+    exp = payload["exp"]
+    if not isinstance(exp, (int, float)) or exp <= now:
+        return None
+    nbf = payload.get("nbf")
+    if nbf is not None and (not isinstance(nbf, (int, float)) or nbf > now):
+        return None
+    # Same rule Authlib applies on the JOSE path: optional, but never issued in the future
+    iat = payload.get("iat")
+    if iat is not None and (not isinstance(iat, (int, float)) or iat > now):
+        return None
+    
+    return payload
+
+def _verify_typed(token: str, expected_type: str) -> Optional[Dict[str, Any]]:
+    """Verify a token through the shared cache and require a specific ``type`` claim"""
+    payload = JWTHandler.verify_token(token)
+    if payload is not None and payload.get("type") == expected_type:
+        return payload
+    return None
+
 
 class JWTHandler:
     """JWT token management for WeReady authentication"""
@@ -42,19 +324,20 @@ class JWTHandler:
         """
         to_encode = data.copy()
         
+        # NumericDate claims as plain ints (RFC 7519) - no datetime objects to build or convert
+        now = int(time.time())
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            lifetime = int(expires_delta.total_seconds())
         else:
-            expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+            lifetime = _ACCESS_TOKEN_LIFETIME_SECONDS
         
         to_encode.update({
-            "exp": expire,
-            "iat": datetime.utcnow(),
+            "exp": now + lifetime,
+            "iat": now,
             "type": "access"
         })
         
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-        return encoded_jwt
+        return JWTHandler._encode_token(to_encode)
     
     @staticmethod
     def create_refresh_token(data: Dict[str, Any]) -> str:
@@ -68,39 +351,64 @@ class JWTHandler:
             JWT refresh token string
         """
         to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        now = int(time.time())
         
         to_encode.update({
-            "exp": expire,
-            "iat": datetime.utcnow(),
+            "exp": now + _REFRESH_TOKEN_LIFETIME_SECONDS,
+            "iat": now,
             "type": "refresh",
             "jti": secrets.token_urlsafe(32)  # Unique token ID for revocation
         })
         
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-        return encoded_jwt
+        return JWTHandler._encode_token(to_encode)
     
     @staticmethod
     def verify_token(token: str) -> Optional[Dict[str, Any]]:
         """
         Verify and decode JWT token
         
+        Results are cached per token for up to ``TOKEN_CACHE_TTL_SECONDS`` (never past
+        the token's own expiry), so the returned payload is shared and must not be mutated.
+        
         Args:
             token: JWT token string
             
         Returns:
             Decoded token payload or None if invalid
         """
+        cache_key = _token_cache_key(token)
+        cached = _token_cache.get(cache_key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        
+        payload = JWTHandler._decode_token(token)
+        if payload is None or cache_key in _logged_out_tokens:
+            _token_cache.set(cache_key, None)
+            return None
+        
+        exp = payload.get("exp")
+        _token_cache.set(cache_key, payload, exp - time.time() if exp else None)
+        return payload
+    
+    @staticmethod
+    def _encode_token(claims: Dict[str, Any]) -> str:
+        """Sign claims, using the direct HMAC path for HS256"""
+        if ALGORITHM == "HS256":
+            return _encode_hs256(claims)
+        return _jose_jwt.encode({"alg": ALGORITHM}, claims, _JOSE_SIGNING_KEY).decode("ascii")
+    
+    @staticmethod
+    def _decode_token(token: str) -> Optional[Dict[str, Any]]:
+        """Decode and validate a JWT without consulting the cache"""
+        if ALGORITHM == "HS256":
+            return _decode_hs256(token)
+        
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            
-            # Check if token is expired
-            exp = payload.get("exp")
-            if exp and datetime.utcfromtimestamp(exp) < datetime.utcnow():
-                return None
-            
-            return payload
-        except JWTError:
+            claims = _jose_jwt.decode(token, _JOSE_VERIFY_KEY, claims_options=_JOSE_CLAIMS_OPTIONS)
+            # Rejects expired (exp) and not-yet-valid (nbf/iat) tokens
+            claims.validate()
+            return dict(claims)
+        except JoseError:
             return None
         except Exception:
             return None
@@ -116,12 +424,7 @@ class JWTHandler:
         Returns:
             Decoded token payload or None if invalid
         """
-        payload = JWTHandler.verify_token(token)
-        
-        if payload and payload.get("type") == "access":
-            return payload
-        
-        return None
+        return _verify_typed(token, "access")
     
     @staticmethod
     def verify_refresh_token(token: str) -> Optional[Dict[str, Any]]:
@@ -134,12 +437,7 @@ class JWTHandler:
         Returns:
             Decoded token payload or None if invalid
         """
-        payload = JWTHandler.verify_token(token)
-        
-        if payload and payload.get("type") == "refresh":
-            return payload
-        
-        return None
+        return _verify_typed(token, "refresh")
     
     @staticmethod
     def create_token_pair(user_data: Dict[str, Any]) -> Dict[str, str]:
@@ -165,8 +463,7 @@ class JWTHandler:
         return {
             "access_token": access_token,
             "refresh_token": refresh_token,
-            "token_type": "bearer",
-            "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60  # seconds
+            **_TOKEN_PAIR_TEMPLATE
         }
     
     @staticmethod
@@ -250,16 +547,115 @@ def refresh_tokens(refresh_token: str, user_data: Dict[str, Any]) -> Optional[Di
     """Refresh token pair"""
     return jwt_handler.refresh_access_token(refresh_token, user_data)
 
+async def revoke_refresh_token(token: str) -> bool:
+    """
+    Revoke a refresh token by its jti until it expires; returns False for invalid tokens.
+    
+    Raises RevocationStoreFull when Redis did not record the revocation and the
+    in-memory deny-list is full.
+    """
+    payload = verify_refresh_token(token)
+    if not payload or not payload.get("jti"):
+        return False
+    
+    remaining = int(payload["exp"] - time.time())
+    if remaining <= 0:
+        return True
+    
+    jti = payload["jti"]
+    if _revocation_redis is not None:
+        try:
+            await _revocation_redis.setex(_revocation_key(jti), remaining, "1")
+        except Exception as exc:
+            logging.warning(f"Redis revocation set failed for {jti}: {exc}")
+        else:
+            # Redis holds the authoritative entry; the local copy only saves a round trip
+            try:
+                _revoked_jtis.add(jti, remaining)
+            except RevocationStoreFull:
+                pass
+            return True
+    _revoked_jtis.add(jti, remaining)
+    return True
+
+
+async def is_refresh_token_revoked(payload: Dict[str, Any]) -> bool:
+    """Check a verified refresh-token payload against the revocation set"""
+    jti = payload.get("jti")
+    if not jti:
+        return False
+    if jti in _revoked_jtis:
+        return True
+    if _revocation_redis is not None:
+        try:
+            return bool(await _revocation_redis.exists(_revocation_key(jti)))
+        except Exception as exc:
+            logging.debug(f"Redis revocation check failed for {jti}: {exc}")
+    return False
+
+
+async def verify_active_refresh_token(token: str) -> Optional[Dict[str, Any]]:
+    """Verify a refresh token and reject it if it has been revoked"""
+    payload = verify_refresh_token(token)
+    if payload is None or await is_refresh_token_revoked(payload):
+        return None
+    return payload
+
+
+def forget_token(token: str) -> None:
+    """
+    Reject a token from now until it expires and drop its cached user (e.g. on logout).
+    
+    Raises RevocationStoreFull when the deny-list is full; the token stays valid then.
+    """
+    payload = JWTHandler.verify_token(token)
+    if not payload:
+        return
+    
+    cache_key = _token_cache_key(token)
+    _logged_out_tokens.add(cache_key, payload["exp"] - time.time())
+    # Negative entry: later checks short-circuit in the verification cache itself
+    _token_cache.set(cache_key, None)
+    if payload.get("user_id") is not None:
+        _user_cache.pop(payload["user_id"])
+
+def forget_user(user_id: Any) -> None:
+    """Drop a cached user snapshot after its columns change, so the next load_user re-reads it"""
+    _user_cache.pop(user_id)
+
+async def load_user(db: AsyncSession, user_id: Any) -> Optional[UserSnapshot]:
+    """
+    Load a read-only snapshot of a User by id, serving recently seen users from the
+    process-local cache. Routes that write fetch the row itself with ``db.get(User, id)``.
+    """
+    # Demo tokens carry string ids like "demo_1a2b3c4d"; they never match the integer key, and
+    # some drivers (asyncpg) raise rather than return nothing for a mistyped primary key
+    if type(user_id) is not int:
+        return None
+    
+    snapshot = _user_cache.get(user_id)
+    if snapshot is not None:
+        return snapshot
+    
+    # Primary-key lookup goes through the identity map before issuing SQL
+    user = await db.get(User, user_id)
+    if user is None:
+        return None
+    snapshot = UserSnapshot.from_user(user)
+    _user_cache.set(user_id, snapshot)
+    return snapshot
+
 # Security
+# FastAPI caches dependency signature introspection per callable, so keep auth dependencies
+# as module-level references (this instance, get_current_user_claims, get_current_user).
+# Wrapping them in functools.partial or lambdas per route defeats that cache.
 security = HTTPBearer()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current user from JWT token"""
-    token = credentials.credentials
-    user_data = verify_access_token(token)
+async def get_current_user_claims(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Dict[str, Any]:
+    """Get the verified access-token payload without loading the User row"""
+    user_data = verify_access_token(credentials.credentials)
     
     if not user_data:
         raise HTTPException(
@@ -267,8 +663,15 @@ async def get_current_user(
             detail="Invalid authentication credentials"
         )
     
-    # Get user from database
-    user = db.query(User).filter(User.id == user_data["user_id"]).first()
+    return user_data
+
+
+async def get_current_user(
+    user_data: Dict[str, Any] = Depends(get_current_user_claims),
+    db: AsyncSession = Depends(get_async_db)
+) -> UserSnapshot:
+    """Get a read-only snapshot of the current user from JWT token"""
+    user = await load_user(db, user_data["user_id"])
     
     if not user:
         raise HTTPException(
@@ -276,4 +679,4 @@ async def get_current_user(
             detail="User not found"
         )
     
-    return user
\ No newline at end of file
+    return user
@@ -5,22 +5,79 @@ Handle GitHub and other OAuth provider authentication, plus email/password auth.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Request, status
-from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import Response
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from authlib.integrations.starlette_client import OAuth
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, EmailStr
+from typing import Optional, Tuple
+import asyncio
+import httpx
+import logging
+import orjson
 import os
-import uuid
-from datetime import datetime, timedelta
+import secrets
+import time
+from datetime import datetime
+from urllib.parse import urlencode
 
-from app.database.connection import get_db
-from app.models.user import User, SubscriptionTier
-from app.auth.jwt_handler import create_access_token, create_refresh_token, create_token_pair
-from app.auth.password_utils import password_validator, validate_email, sanitize_username
+from app.database.connection import get_async_db
+from app.models.user import OAuthProvider, User, SubscriptionTier, TRIAL_PERIOD, as_utc, utc_now
+from app.models.analysis import Analysis
+from app.auth.jwt_handler import (
+    create_access_token, create_refresh_token, create_token_pair, forget_user, load_user,
+    verify_access_token, verify_active_refresh_token
+)
+from app.auth.password_utils import (
+    CHAR_DIGIT, CHAR_LOWER, CHAR_SPECIAL, CHAR_UPPER, character_classes,
+    password_validator, sanitize_username
+)
+
+logger = logging.getLogger(__name__)
 
+# Datetimes in response bodies are left as objects; they are rendered to ISO 8601 on the way out
 router = APIRouter()
 
+try:  # HTTP/2 needs the optional h2 package (httpx[http2])
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - falls back to HTTP/1.1 keep-alive
+    _HTTP2_AVAILABLE = False
+
+class _SharedTransport(httpx.AsyncHTTPTransport):
+    """Connection pool shared by Authlib's per-call clients, which must not close it"""
+    
+    async def __aexit__(self, *args) -> None:
+        pass
+    
+    async def aclose(self) -> None:
+        pass
+    
+    async def close_pool(self) -> None:
+        await super().aclose()
+
+# Authlib builds a fresh httpx client for every provider call; handing each one this transport
+# keeps TLS connections to GitHub/Google/LinkedIn alive across logins
+OAUTH_TRANSPORT = _SharedTransport(
+    http2=_HTTP2_AVAILABLE,
+    limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+)
+OAUTH_HTTP_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+
+# Long-lived client for provider user-info APIs, so those calls skip Authlib's per-call client setup
+_http_client = httpx.AsyncClient(transport=OAUTH_TRANSPORT, timeout=OAUTH_HTTP_TIMEOUT)
+
+def _provider_get(url: str, token: dict):
+    """GET a provider API with the bearer token from a completed OAuth exchange"""
+    return _http_client.get(url, headers={"Authorization": f"Bearer {token['access_token']}"})
+
+async def close_oauth_transport() -> None:
+    """Close the shared provider client and its pooled connections (application shutdown)"""
+    await _http_client.aclose()
+    await OAUTH_TRANSPORT.close_pool()
+
 # OAuth configuration
 oauth = OAuth()
 
@@ -33,7 +90,9 @@ oauth.register(
     authorize_url='https://github.com/login/oauth/authorize',
     api_base_url='https://api.github.com/',
     client_kwargs={
-        'scope': 'user:email'
+        'scope': 'user:email',
+        'transport': OAUTH_TRANSPORT,
+        'timeout': OAUTH_HTTP_TIMEOUT
     }
 )
 
@@ -44,7 +103,9 @@ oauth.register(
     client_secret=os.getenv('GOOGLE_CLIENT_SECRET', 'your_google_client_secret'),
     server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
     client_kwargs={
-        'scope': 'openid email profile'
+        'scope': 'openid email profile',
+        'transport': OAUTH_TRANSPORT,
+        'timeout': OAUTH_HTTP_TIMEOUT
     }
 )
 
@@ -55,10 +116,73 @@ oauth.register(
     client_secret=os.getenv('LINKEDIN_CLIENT_SECRET', 'your_linkedin_client_secret'),
     server_metadata_url='https://www.linkedin.com/oauth/v2',
     client_kwargs={
-        'scope': 'r_liteprofile r_emailaddress'
+        'scope': 'r_liteprofile r_emailaddress',
+        'transport': OAUTH_TRANSPORT,
+        'timeout': OAUTH_HTTP_TIMEOUT
     }
 )
 
+SUPPORTED_PROVIDERS = frozenset({'github', 'google', 'linkedin'})
+PROVIDER_ENUM = {name: OAuthProvider(name) for name in SUPPORTED_PROVIDERS}
+BASE_URL = os.getenv('BASE_URL', 'http://localhost:8000')
+FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000')
+OAUTH_REDIRECT_URIS = {name: f"{BASE_URL}/api/auth/{name}/callback" for name in SUPPORTED_PROVIDERS}
+FRONTEND_CALLBACK_URL = f"{FRONTEND_URL}/auth/callback"
+OAUTH_ERROR_REDIRECT_URL = f"{FRONTEND_URL}/auth/error?" + urlencode({"message": "Authentication failed"})
+
+def _redirect(url: str) -> Response:
+    """307 to an already-encoded URL; skips RedirectResponse re-quoting it, and keeps tokens out of caches"""
+    return Response(status_code=307, headers={"location": url, "cache-control": "no-store"})
+
+# Clients are built once; Authlib clients are safe to share across requests
+OAUTH_CLIENTS = {name: oauth.create_client(name) for name in SUPPORTED_PROVIDERS}
+
+# Discovery documents and JWKS are re-fetched after this long so provider key rotation is picked up
+OAUTH_METADATA_TTL_SECONDS = int(os.getenv("OAUTH_METADATA_TTL_SECONDS", str(24 * 60 * 60)))
+# A failed fetch is retried after this long instead of waiting out the full TTL
+OAUTH_METADATA_RETRY_SECONDS = 60
+_metadata_loaded_at = 0.0
+_metadata_refresh: Optional[asyncio.Task] = None
+
+async def _prefetch_provider_metadata(client, force: bool = False) -> None:
+    if force:
+        # Authlib only re-reads the discovery URL once its load marker is gone
+        client.server_metadata.pop('_loaded_at', None)
+    metadata = await client.load_server_metadata()
+    if metadata.get('jwks_uri'):
+        await client.fetch_jwk_set(force=force)
+
+async def prefetch_oauth_metadata(force: bool = False) -> None:
+    """Load discovery documents and JWKS at startup so the first login per worker skips them"""
+    # Authlib caches both on the client after the first load; providers without a
+    # discovery URL (GitHub) return their static metadata immediately
+    global _metadata_loaded_at
+    names = list(OAUTH_CLIENTS)
+    results = await asyncio.gather(
+        *(_prefetch_provider_metadata(OAUTH_CLIENTS[name], force) for name in names),
+        return_exceptions=True
+    )
+    failed = False
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            failed = True
+            logger.warning("OAuth metadata prefetch failed for provider=%s: %s", name, result)
+    
+    # Only a complete fetch starts the TTL; after a failure the next login retries shortly
+    now = time.monotonic()
+    if failed:
+        _metadata_loaded_at = now - OAUTH_METADATA_TTL_SECONDS + OAUTH_METADATA_RETRY_SECONDS
+    else:
+        _metadata_loaded_at = now
+
+def _refresh_stale_oauth_metadata() -> None:
+    """Start a background re-fetch once the cached metadata passes its TTL; logins keep using the cache"""
+    global _metadata_refresh
+    if time.monotonic() - _metadata_loaded_at < OAUTH_METADATA_TTL_SECONDS:
+        return
+    if _metadata_refresh is None or _metadata_refresh.done():
+        _metadata_refresh = asyncio.create_task(prefetch_oauth_metadata(force=True))
+
 class OAuthResponse(BaseModel):
     access_token: str
     refresh_token: str
@@ -66,12 +190,19 @@ class OAuthResponse(BaseModel):
     is_new_user: bool
     trial_days_remaining: int
 
+# Immutable request bodies; whitespace is left alone because it is significant in passwords
+_REQUEST_MODEL_CONFIG = ConfigDict(extra="forbid", frozen=True)
+
 class SignupRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+    
     email: EmailStr
     password: str
     full_name: Optional[str] = None
 
 class LoginRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+    
     email: EmailStr
     password: str
 
@@ -84,138 +215,239 @@ class AuthResponse(BaseModel):
     is_new_user: bool = False
     trial_days_remaining: int = 0
 
+# Built once with a bound parameter: each lookup reuses the statement and its cached compilation
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
+# Claims a free analysis in one UPDATE; the user_id IS NULL guard keeps an owned analysis untouched
+_CLAIM_ANALYSIS = (
+    update(Analysis)
+    .where(Analysis.id == bindparam("analysis_id"), Analysis.user_id.is_(None))
+    .values(user_id=bindparam("owner_id"))
+    .execution_options(synchronize_session=False)
+)
+
+# Backends with INSERT ... ON CONFLICT ... RETURNING, which the OAuth user upsert relies on
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def _new_oauth_user_values(provider: str, user_info: dict, now: datetime) -> dict:
+    """Column values for a first-time OAuth user, with provider fields set by the model itself"""
+    user = User(
+        email=user_info['email'],
+        full_name=user_info['name'],
+        avatar_url=user_info.get('avatar_url'),
+        username=user_info.get('username'),
+        subscription_tier=SubscriptionTier.FREE,
+        trial_started=now,
+        trial_ends=now + TRIAL_PERIOD
+    )
+    user.add_oauth_provider(PROVIDER_ENUM[provider], {
+        'id': str(user_info['id']),
+        'username': user_info.get('username'),
+        'avatar_url': user_info.get('avatar_url')
+    })
+    values = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+    return {key: value for key, value in values.items() if value is not None}
+
+async def _upsert_oauth_user(db: AsyncSession, provider: str, user_info: dict, now: datetime) -> Tuple[User, bool]:
+    """
+    Create or refresh an OAuth user in one statement and return (user, is_new_user)
+    
+    The email unique index arbitrates concurrent first logins. The conflict branch is the only
+    one that sets last_login, so a row that comes back without it was just inserted.
+    """
+    dialect = db.get_bind().dialect.name
+    dialect_insert = _UPSERT_INSERTS.get(dialect)
+    if dialect_insert is None:
+        raise RuntimeError(f"OAuth sign-in needs INSERT ... ON CONFLICT; unsupported database dialect {dialect!r}")
+    
+    insert_user = dialect_insert(User).values(_new_oauth_user_values(provider, user_info, now))
+    upsert = insert_user.on_conflict_do_update(
+        index_elements=[User.email],
+        set_={
+            # Providers may omit a display name or avatar; keep what is stored rather than clear it
+            "full_name": func.coalesce(insert_user.excluded.full_name, User.full_name),
+            "avatar_url": func.coalesce(insert_user.excluded.avatar_url, User.avatar_url),
+            "last_login": now,
+            "updated_at": func.now()
+        }
+    ).returning(User)
+    user = (await db.scalars(upsert, execution_options={"populate_existing": True})).one()
+    return user, user.last_login is None
+
+async def _user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    return (await db.execute(_USER_BY_EMAIL, {"email": email})).scalar_one_or_none()
+
+# Profile claims carried in access tokens so /auth/me can answer without a database read
+_PROFILE_CLAIMS = ("user_id", "email", "full_name", "avatar_url", "subscription_tier", "trial_ends", "created_at")
+
+def _token_claims(user: User) -> dict:
+    """Build access-token claims for a user, including the profile fields /auth/me returns"""
+    return {
+        "user_id": user.id,
+        "email": user.email,
+        "subscription_tier": user.subscription_tier.value,
+        "username": user.username,
+        "full_name": user.full_name,
+        "avatar_url": user.avatar_url,
+        "trial_ends": user.trial_ends.isoformat() if user.trial_started and user.trial_ends else None,
+        "created_at": user.created_at.isoformat() if user.created_at else None
+    }
+
+def _profile_from_claims(payload: dict) -> dict:
+    """Rebuild the /auth/me response from verified access-token claims"""
+    trial_ends = payload["trial_ends"]
+    is_trial_active = False
+    trial_days_remaining = 0
+    if trial_ends:
+        trial_ends = as_utc(datetime.fromisoformat(trial_ends))
+        now = utc_now()
+        if now < trial_ends:
+            is_trial_active = True
+            trial_days_remaining = (trial_ends - now).days
+    
+    return {
+        "id": payload["user_id"],
+        "email": payload["email"],
+        "name": payload["full_name"],
+        "avatar_url": payload["avatar_url"],
+        "subscription_tier": payload["subscription_tier"],
+        "trial_days_remaining": trial_days_remaining,
+        "is_trial_active": is_trial_active,
+        "created_at": payload["created_at"]
+    }
+
+# Registered ahead of /auth/{provider}, which would otherwise capture "me" as a provider name
+@router.get("/auth/me")
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Get current user info from JWT token"""
+    
+    # Get token from Authorization header
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="No valid authorization header")
+    
+    token = auth_header.split(" ")[1]
+    payload = verify_access_token(token)
+    if payload is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    
+    # Tokens issued with profile claims answer straight from the payload. Called on every page
+    # load, so the body is serialized with orjson rather than through jsonable_encoder.
+    if all(claim in payload for claim in _PROFILE_CLAIMS):
+        return Response(content=orjson.dumps(_profile_from_claims(payload)), media_type="application/json")
+    
+    # Legacy tokens without profile claims fall back to the database
+    user_id = payload.get("user_id")
+    user = await load_user(db, user_id)
+    
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    
+    now = utc_now()
+    is_trial_active, trial_days_remaining = user.trial_status(now)
+    
+    return Response(content=orjson.dumps({
+        "id": user.id,
+        "email": user.email,
+        "name": user.full_name,
+        "avatar_url": user.avatar_url,
+        "subscription_tier": user.subscription_tier.value,
+        "trial_days_remaining": trial_days_remaining,
+        "is_trial_active": is_trial_active,
+        "created_at": user.created_at
+    }), media_type="application/json")
+
 @router.get("/auth/{provider}")
 async def oauth_login(provider: str, request: Request):
     """Initiate OAuth login with the specified provider"""
     
-    if provider not in ['github', 'google', 'linkedin']:
+    if provider not in SUPPORTED_PROVIDERS:
         raise HTTPException(status_code=400, detail="Unsupported OAuth provider")
     
-    client = oauth.create_client(provider)
+    client = OAUTH_CLIENTS.get(provider)
     if not client:
         raise HTTPException(status_code=500, detail=f"OAuth client for {provider} not configured")
     
-    # Store the analysis_id in session if provided for post-signup linking
-    analysis_id = request.query_params.get('analysis_id')
-    if analysis_id:
-        request.session['analysis_id'] = analysis_id
+    _refresh_stale_oauth_metadata()
     
-    # Redirect URI for the callback
-    redirect_uri = f"{os.getenv('BASE_URL', 'http://localhost:8000')}/api/auth/{provider}/callback"
+    # Carry the analysis_id for post-signup linking in the OAuth state rather than our own
+    # session key; the random prefix keeps the state unguessable for Authlib's CSRF check
+    state = None
+    analysis_id = request.query_params.get('analysis_id')
+    if analysis_id and analysis_id.isdigit():
+        state = f"{secrets.token_urlsafe(24)}.{analysis_id}"
     
-    return await client.authorize_redirect(request, redirect_uri)
+    return await client.authorize_redirect(request, OAUTH_REDIRECT_URIS[provider], state=state)
 
 @router.get("/auth/{provider}/callback")
-async def oauth_callback(provider: str, request: Request, db: Session = Depends(get_db)):
+async def oauth_callback(provider: str, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Handle OAuth callback and create/login user"""
     
-    if provider not in ['github', 'google', 'linkedin']:
+    if provider not in SUPPORTED_PROVIDERS:
         raise HTTPException(status_code=400, detail="Unsupported OAuth provider")
     
     try:
-        client = oauth.create_client(provider)
+        now = utc_now()
+        client = OAUTH_CLIENTS[provider]
         token = await client.authorize_access_token(request)
         
         # Get user info from the provider
-        if provider == 'github':
-            user_info = await get_github_user_info(client, token)
-        elif provider == 'google':
-            user_info = await get_google_user_info(client, token)
-        elif provider == 'linkedin':
-            user_info = await get_linkedin_user_info(client, token)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported provider")
+        user_info = await USER_INFO_FETCHERS[provider](token)
         
-        # Find or create user
-        user = db.query(User).filter(User.email == user_info['email']).first()
-        is_new_user = False
+        # Create or refresh the user in one statement
+        user, is_new_user = await _upsert_oauth_user(db, provider, user_info, now)
         
-        if not user:
-            # Create new user
-            is_new_user = True
-            user = User(
-                email=user_info['email'],
-                full_name=user_info['name'],
-                avatar_url=user_info.get('avatar_url'),
-                username=user_info.get('username'),
-                subscription_tier=SubscriptionTier.FREE,
-                trial_started=datetime.utcnow(),
-                trial_ends=datetime.utcnow() + timedelta(days=7)
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-            
-            # Add OAuth provider information
-            from app.models.user import OAuthProvider
-            provider_enum = getattr(OAuthProvider, provider.upper())
-            user.add_oauth_provider(provider_enum, {
-                'id': str(user_info['id']),
-                'username': user_info.get('username'),
-                'avatar_url': user_info.get('avatar_url')
-            })
-            db.commit()
-            
-            # Link any pending free analysis to this user
-            analysis_id = request.session.get('analysis_id')
-            if analysis_id:
-                from app.models.analysis import Analysis
-                analysis = db.query(Analysis).filter(
-                    Analysis.id == int(analysis_id),
-                    Analysis.user_id.is_(None)
-                ).first()
-                if analysis:
-                    analysis.user_id = user.id
-                    db.commit()
-        else:
-            # Update existing user with latest OAuth info
-            user.name = user_info['name']
-            user.avatar_url = user_info.get('avatar_url')
-            user.last_login_at = datetime.utcnow()
-            db.commit()
+        if is_new_user:
+            # Link any pending free analysis to this user; state was verified by
+            # authorize_access_token. Commits with the user row, before the redirect.
+            analysis_id = request.query_params.get('state', '').partition('.')[2]
+            if analysis_id.isdigit():
+                await db.execute(_CLAIM_ANALYSIS, {"analysis_id": int(analysis_id), "owner_id": user.id})
+        
+        await db.commit()
+        if not is_new_user:
+            forget_user(user.id)
         
         # Generate JWT tokens
-        access_token = create_access_token({"sub": user.email, "user_id": user.id})
+        access_token = create_access_token({"sub": user.email, **_token_claims(user)})
         refresh_token = create_refresh_token({"sub": user.email, "user_id": user.id})
         
         # Calculate trial days remaining
-        trial_days_remaining = 0
-        if user.is_trial_active():
-            trial_days_remaining = (user.trial_ends - datetime.utcnow()).days
-        
-        # Redirect to frontend with tokens
-        frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:3000')
-        redirect_url = f"{frontend_url}/auth/callback?access_token={access_token}&refresh_token={refresh_token}&is_new_user={is_new_user}&trial_days={trial_days_remaining}"
-        
-        return RedirectResponse(url=redirect_url)
-        
-    except Exception as e:
-        print(f"OAuth callback error: {e}")
+        _, trial_days_remaining = user.trial_status(now)
+        
+        # Redirect to frontend with tokens in the fragment: browsers never send it to servers,
+        # so tokens stay out of access logs and Referer headers
+        fragment = urlencode((
+            ("access_token", access_token),
+            ("refresh_token", refresh_token),
+            ("is_new_user", "true" if is_new_user else "false"),
+            ("trial_days", trial_days_remaining)
+        ))
+        redirect_url = f"{FRONTEND_CALLBACK_URL}#{fragment}"
+        
+        return _redirect(redirect_url)
+        
+    except Exception:
+        logger.exception("OAuth callback error for provider=%s", provider)
         # Redirect to frontend with error
-        frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:3000')
-        redirect_url = f"{frontend_url}/auth/error?message=Authentication failed"
-        return RedirectResponse(url=redirect_url)
+        return _redirect(OAUTH_ERROR_REDIRECT_URL)
 
-async def get_github_user_info(client, token):
+async def get_github_user_info(token):
     """Get user info from GitHub API"""
     
-    # Get user profile
-    resp = await client.get('https://api.github.com/user', token=token)
+    # Fetch profile and emails (might be private) concurrently
+    resp, email_resp = await asyncio.gather(
+        _provider_get('https://api.github.com/user', token),
+        _provider_get('https://api.github.com/user/emails', token)
+    )
     resp.raise_for_status()
-    user_data = resp.json()
+    user_data = orjson.loads(resp.content)
     
-    # Get user email (might be private)
-    email_resp = await client.get('https://api.github.com/user/emails', token=token)
     email_resp.raise_for_status()
-    emails = email_resp.json()
-    
-    # Find primary email
-    primary_email = None
-    for email in emails:
-        if email.get('primary', False):
-            primary_email = email['email']
-            break
+    emails = orjson.loads(email_resp.content)
     
+    # Primary email, else the first one listed
+    primary_email = next((email['email'] for email in emails if email.get('primary')), None)
     if not primary_email and emails:
         primary_email = emails[0]['email']
     
@@ -227,10 +459,10 @@ async def get_github_user_info(client, token):
         'username': user_data.get('login')
     }
 
-async def get_google_user_info(client, token):
+async def get_google_user_info(token):
     """Get user info from Google API"""
     
-    resp = await client.get('https://www.googleapis.com/oauth2/v2/userinfo', token=token)
+    resp = await _provider_get('https://www.googleapis.com/oauth2/v2/userinfo', token)
     resp.raise_for_status()
     user_data = resp.json()
     
@@ -242,22 +474,23 @@ async def get_google_user_info(client, token):
         'username': user_data.get('email')
     }
 
-async def get_linkedin_user_info(client, token):
+async def get_linkedin_user_info(token):
     """Get user info from LinkedIn API"""
     
-    # Get profile info
-    profile_resp = await client.get(
-        'https://api.linkedin.com/v2/people/~:(id,firstName,lastName,profilePicture(displayImage~:playableStreams))',
-        token=token
+    # Fetch profile info and email concurrently
+    profile_resp, email_resp = await asyncio.gather(
+        _provider_get(
+            'https://api.linkedin.com/v2/people/~:(id,firstName,lastName,profilePicture(displayImage~:playableStreams))',
+            token
+        ),
+        _provider_get(
+            'https://api.linkedin.com/v2/emailAddress?q=members&projection=(elements*(handle~))',
+            token
+        )
     )
     profile_resp.raise_for_status()
     profile_data = profile_resp.json()
     
-    # Get email
-    email_resp = await client.get(
-        'https://api.linkedin.com/v2/emailAddress?q=members&projection=(elements*(handle~))',
-        token=token
-    )
     email_resp.raise_for_status()
     email_data = email_resp.json()
     
@@ -285,73 +518,57 @@ async def get_linkedin_user_info(client, token):
         'username': email
     }
 
+# Provider name -> coroutine returning normalized user info
+USER_INFO_FETCHERS = {
+    'github': get_github_user_info,
+    'google': get_google_user_info,
+    'linkedin': get_linkedin_user_info
+}
+
 @router.post("/auth/refresh")
-async def refresh_access_token(refresh_token: str, db: Session = Depends(get_db)):
+async def refresh_access_token(refresh_token: str, db: AsyncSession = Depends(get_async_db)):
     """Refresh access token using refresh token"""
     
-    try:
-        from app.auth.jwt_handler import verify_refresh_token
-        payload = verify_refresh_token(refresh_token)
-        
-        user_id = payload.get("user_id")
-        user = db.query(User).filter(User.id == user_id).first()
-        
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        
-        # Generate new access token
-        access_token = create_access_token({"sub": user.email, "user_id": user.id})
-        
-        return {
-            "access_token": access_token,
-            "token_type": "bearer"
-        }
-        
-    except Exception as e:
+    # Rejections are plain None checks: expired, malformed and revoked tokens all verify to None
+    payload = await verify_active_refresh_token(refresh_token)
+    if payload is None:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
+    
+    user = await load_user(db, payload.get("user_id"))
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    
+    # Generate new access token
+    access_token = create_access_token({"sub": user.email, **_token_claims(user)})
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer"
+    }
 
-@router.get("/auth/me")
-async def get_current_user(request: Request, db: Session = Depends(get_db)):
-    """Get current user info from JWT token"""
+class LogoutRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+    
+    refresh_token: Optional[str] = None
+
+@router.post("/auth/logout")
+async def logout(request: Request, body: Optional[LogoutRequest] = None):
+    """Logout user (client should discard tokens); the refresh token travels in the JSON body"""
+    from app.auth.jwt_handler import RevocationStoreFull, forget_token, revoke_refresh_token
     
     try:
-        from app.auth.jwt_handler import verify_access_token
-        
-        # Get token from Authorization header
+        # Drop any cached verification so the token stops short-circuiting auth checks
         auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            raise HTTPException(status_code=401, detail="No valid authorization header")
-        
-        token = auth_header.split(" ")[1]
-        payload = verify_access_token(token)
+        if auth_header and auth_header.startswith("Bearer "):
+            forget_token(auth_header.split(" ")[1])
         
-        user_id = payload.get("user_id")
-        user = db.query(User).filter(User.id == user_id).first()
-        
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        
-        trial_days_remaining = 0
-        if user.is_trial_active():
-            trial_days_remaining = (user.trial_ends - datetime.utcnow()).days
-        
-        return {
-            "id": user.id,
-            "email": user.email,
-            "name": user.name,
-            "avatar_url": user.avatar_url,
-            "subscription_tier": user.subscription_tier.value,
-            "trial_days_remaining": trial_days_remaining,
-            "is_trial_active": user.is_trial_active(),
-            "created_at": user.created_at.isoformat()
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-@router.post("/auth/logout")
-async def logout():
-    """Logout user (client should discard tokens)"""
+        # Revoke the refresh token so it can no longer mint access tokens
+        if body is not None and body.refresh_token:
+            await revoke_refresh_token(body.refresh_token)
+    except RevocationStoreFull:
+        logger.error("Token revocation store is full; refusing logout so no revocation is dropped")
+        raise HTTPException(status_code=503, detail="Logout is temporarily unavailable, please retry")
+    
     return {"message": "Logged out successfully"}
 
 class PasswordStrengthRequest(BaseModel):
@@ -381,23 +598,25 @@ async def check_password_strength(request: PasswordStrengthRequest):
     else:
         feedback.append("Consider using 12+ characters for better security")
     
-    # Character type checks
-    if any(c.islower() for c in password):
+    # Character type checks: the same classification the signup validator applies
+    classes = character_classes(password)
+    
+    if classes & CHAR_LOWER:
         score += 1
     else:
         feedback.append("Include lowercase letters")
     
-    if any(c.isupper() for c in password):
+    if classes & CHAR_UPPER:
         score += 1
     else:
         feedback.append("Include uppercase letters")
     
-    if any(c.isdigit() for c in password):
+    if classes & CHAR_DIGIT:
         score += 1
     else:
         feedback.append("Include numbers")
     
-    if any(c in "!@#$%^&*(),.?\":{}|<>" for c in password):
+    if classes & CHAR_SPECIAL:
         score += 1
     else:
         feedback.append("Include special characters (!@#$%^&* etc.)")
@@ -417,21 +636,18 @@ async def check_password_strength(request: PasswordStrengthRequest):
         feedback=feedback
     )
 
+def _is_demo_email(email: str) -> bool:
+    """Demo accounts are demo@... or ...@*.demo; slice compares avoid two method lookups per request"""
+    return email[:5] == 'demo@' or email[-5:] == '.demo'
+
 @router.post("/auth/signup", response_model=AuthResponse)
-async def signup(signup_data: SignupRequest, db: Session = Depends(get_db)):
+async def signup(signup_data: SignupRequest, db: AsyncSession = Depends(get_async_db)):
     """Create new user account with email and password"""
     
     # Demo mode check - allow unlimited signups for demo emails
-    if signup_data.email.startswith('demo@') or signup_data.email.endswith('.demo'):
+    if _is_demo_email(signup_data.email):
         return await handle_demo_signup(signup_data)
     
-    # Validate email format
-    if not validate_email(signup_data.email):
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid email format"
-        )
-    
     # Validate password strength
     is_valid, issues = password_validator.validate_password(signup_data.password)
     if not is_valid:
@@ -440,45 +656,39 @@ async def signup(signup_data: SignupRequest, db: Session = Depends(get_db)):
             detail=f"Password validation failed: {', '.join(issues)}"
         )
     
-    # Check if user already exists
-    existing_user = db.query(User).filter(User.email == signup_data.email).first()
-    if existing_user:
-        raise HTTPException(
-            status_code=400,
-            detail="Account with this email already exists"
-        )
-    
     try:
-        # Create new user
-        user = User.create_from_email_password(
+        now = utc_now()
+        # Create new user; bcrypt hashing runs off the event loop
+        user = await asyncio.to_thread(
+            User.create_from_email_password,
             email=signup_data.email,
             password=signup_data.password,
-            full_name=signup_data.full_name
+            full_name=signup_data.full_name,
+            now=now
         )
         
         # Generate username from email
         user.username = sanitize_username(signup_data.email)
         
-        # Save to database
+        # Save to database; the unique index on email rejects duplicates without a prior SELECT
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            if "email" in str(e.orig).lower():
+                raise HTTPException(
+                    status_code=400,
+                    detail="Account with this email already exists"
+                )
+            raise
+        await db.refresh(user)
         
         # Create JWT tokens
-        token_data = {
-            "user_id": user.id,
-            "email": user.email,
-            "subscription_tier": user.subscription_tier.value,
-            "username": user.username,
-            "full_name": user.full_name
-        }
-        
-        tokens = create_token_pair(token_data)
+        tokens = create_token_pair(_token_claims(user))
         
         # Calculate trial days remaining
-        trial_days_remaining = 0
-        if user.is_trial_active():
-            trial_days_remaining = (user.trial_ends - datetime.now()).days
+        is_trial_active, trial_days_remaining = user.trial_status(now)
         
         return AuthResponse(
             access_token=tokens["access_token"],
@@ -492,31 +702,33 @@ async def signup(signup_data: SignupRequest, db: Session = Depends(get_db)):
                 "username": user.username,
                 "avatar_url": user.avatar_url,
                 "subscription_tier": user.subscription_tier.value,
-                "is_trial_active": user.is_trial_active(),
+                "is_trial_active": is_trial_active,
                 "trial_days_remaining": trial_days_remaining,
-                "created_at": user.created_at.isoformat()
+                "created_at": user.created_at
             },
             is_new_user=True,
             trial_days_remaining=trial_days_remaining
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Failed to create account: {str(e)}"
         )
 
 @router.post("/auth/login", response_model=AuthResponse)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     """Login user with email and password"""
     
     # Demo mode check - allow unlimited logins for demo emails
-    if login_data.email.startswith('demo@') or login_data.email.endswith('.demo'):
+    if _is_demo_email(login_data.email):
         return await handle_demo_login(login_data)
     
     # Find user by email
-    user = db.query(User).filter(User.email == login_data.email).first()
+    user = await _user_by_email(db, login_data.email)
     if not user:
         raise HTTPException(
             status_code=401,
@@ -530,8 +742,8 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
             detail="This account was created with social login. Please use the 'Sign in with...' button."
         )
     
-    # Verify password
-    if not user.verify_password(login_data.password):
+    # Verify password (bcrypt) off the event loop
+    if not await asyncio.to_thread(user.verify_password, login_data.password):
         raise HTTPException(
             status_code=401,
             detail="Invalid email or password"
@@ -546,24 +758,16 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     
     try:
         # Update last login time
-        user.last_login = datetime.now()
-        db.commit()
+        now = utc_now()
+        user.last_login = now
+        await db.commit()
+        forget_user(user.id)
         
         # Create JWT tokens
-        token_data = {
-            "user_id": user.id,
-            "email": user.email,
-            "subscription_tier": user.subscription_tier.value,
-            "username": user.username,
-            "full_name": user.full_name
-        }
-        
-        tokens = create_token_pair(token_data)
+        tokens = create_token_pair(_token_claims(user))
         
         # Calculate trial days remaining
-        trial_days_remaining = 0
-        if user.is_trial_active():
-            trial_days_remaining = (user.trial_ends - datetime.now()).days
+        is_trial_active, trial_days_remaining = user.trial_status(now)
         
         return AuthResponse(
             access_token=tokens["access_token"],
@@ -577,34 +781,42 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
                 "username": user.username,
                 "avatar_url": user.avatar_url,
                 "subscription_tier": user.subscription_tier.value,
-                "is_trial_active": user.is_trial_active(),
+                "is_trial_active": is_trial_active,
                 "trial_days_remaining": trial_days_remaining,
-                "last_login": user.last_login.isoformat() if user.last_login else None
+                "last_login": user.last_login
             },
             is_new_user=False,
             trial_days_remaining=trial_days_remaining
         )
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Login failed: {str(e)}"
         )
 
-async def handle_demo_signup(signup_data: SignupRequest) -> AuthResponse:
-    """Handle demo signup - always successful, no data storage"""
+def _demo_session(email: str, full_name: str) -> Tuple[dict, dict]:
+    """
+    Return (demo user data, token pair) for a demo sign-in.
     
-    # Generate demo tokens (not database-backed)
+    Every call mints a fresh pair: signing is a cheap HMAC, and a shared pair would report a
+    stale expires_in and let one caller's logout revoke another's session.
+    """
     demo_user_data = {
-        "user_id": f"demo_{uuid.uuid4().hex[:8]}",
-        "email": signup_data.email,
+        "user_id": f"demo_{secrets.token_hex(4)}",
+        "email": email,
         "subscription_tier": "demo",
-        "username": signup_data.email.split('@')[0],
-        "full_name": signup_data.full_name or "Demo User"
+        "username": email.split('@')[0],
+        "full_name": full_name
     }
+    return demo_user_data, create_token_pair(demo_user_data)
+
+async def handle_demo_signup(signup_data: SignupRequest) -> AuthResponse:
+    """Handle demo signup - always successful, no data storage"""
     
-    tokens = create_token_pair(demo_user_data)
+    # Demo tokens (not database-backed)
+    demo_user_data, tokens = _demo_session(signup_data.email, signup_data.full_name or "Demo User")
     
     return AuthResponse(
         access_token=tokens["access_token"],
@@ -620,7 +832,7 @@ async def handle_demo_signup(signup_data: SignupRequest) -> AuthResponse:
             "subscription_tier": "demo",
             "is_trial_active": True,
             "trial_days_remaining": 999,
-            "created_at": datetime.now().isoformat()
+            "created_at": utc_now()
         },
         is_new_user=True,
         trial_days_remaining=999
@@ -629,16 +841,8 @@ async def handle_demo_signup(signup_data: SignupRequest) -> AuthResponse:
 async def handle_demo_login(login_data: LoginRequest) -> AuthResponse:
     """Handle demo login - always successful, no data storage"""
     
-    # Generate demo tokens (not database-backed)
-    demo_user_data = {
-        "user_id": f"demo_{uuid.uuid4().hex[:8]}",
-        "email": login_data.email,
-        "subscription_tier": "demo",
-        "username": login_data.email.split('@')[0],
-        "full_name": "Demo User"
-    }
-    
-    tokens = create_token_pair(demo_user_data)
+    # Demo tokens (not database-backed)
+    demo_user_data, tokens = _demo_session(login_data.email, "Demo User")
     
     return AuthResponse(
         access_token=tokens["access_token"],
@@ -654,18 +858,18 @@ async def handle_demo_login(login_data: LoginRequest) -> AuthResponse:
             "subscription_tier": "demo",
             "is_trial_active": True,
             "trial_days_remaining": 999,
-            "last_login": datetime.now().isoformat()
+            "last_login": utc_now()
         },
         is_new_user=False,
         trial_days_remaining=999
     )
 
 @router.get("/auth/github/repos")
-async def get_github_repos(request: Request, db: Session = Depends(get_db)):
+async def get_github_repos(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get user's GitHub repositories"""
     
     try:
-        from app.auth.jwt_handler import verify_access_token
+        from app.auth.jwt_handler import load_user, verify_access_token
         
         # Get token from Authorization header
         auth_header = request.headers.get("Authorization")
@@ -682,19 +886,13 @@ async def get_github_repos(request: Request, db: Session = Depends(get_db)):
             # Return mock repositories for demo users
             pass
         else:
-            user = db.query(User).filter(User.id == user_id).first()
+            user = await load_user(db, user_id)
             
             if not user:
                 raise HTTPException(status_code=401, detail="User not found")
             
             # Check if user has GitHub OAuth provider linked
-            github_provider = None
-            for provider in user.oauth_providers:
-                if provider.provider.value == 'GITHUB':
-                    github_provider = provider
-                    break
-            
-            if not github_provider:
+            if not user.get_oauth_provider(OAuthProvider.GITHUB):
                 raise HTTPException(status_code=400, detail="GitHub account not linked")
         
         # Get GitHub access token (this would need to be stored when linking)
@@ -743,11 +941,11 @@ async def get_github_repos(request: Request, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to fetch repositories: {str(e)}")
 
 @router.post("/auth/github/link-repo")
-async def link_github_repo(request: Request, repo_data: dict, db: Session = Depends(get_db)):
+async def link_github_repo(request: Request, repo_data: dict, db: AsyncSession = Depends(get_async_db)):
     """Link a GitHub repository to user's account for analysis"""
     
     try:
-        from app.auth.jwt_handler import verify_access_token
+        from app.auth.jwt_handler import load_user, verify_access_token
         
         # Get token from Authorization header
         auth_header = request.headers.get("Authorization")
@@ -769,7 +967,7 @@ async def link_github_repo(request: Request, repo_data: dict, db: Session = Depe
             }
         
         # Handle regular users
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await load_user(db, user_id)
         
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
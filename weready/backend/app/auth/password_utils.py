@@ -4,13 +4,134 @@ Password Utilities
 Password validation, strength checking, and security utilities for WeReady authentication.
 """
 
+import asyncio
+import hashlib
+import logging
+import math
+import os
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from passlib.context import CryptContext
 
+logger = logging.getLogger(__name__)
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Compiled once at import rather than looked up per call. EMAIL_PATTERN is applied with
+# fullmatch: a $ anchor under re.match would also accept a trailing newline
+EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+_EMAIL_RE = re.compile(EMAIL_PATTERN)
+_USERNAME_STRIP_RE = re.compile(r'[^a-zA-Z0-9_]')
+_LOWER_RE = re.compile(r'[a-z]')
+_UPPER_RE = re.compile(r'[A-Z]')
+_DIGIT_RE = re.compile(r'\d')
+_SPECIAL_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+_REPEATED_RE = re.compile(r'(.)\1{2,}')
+_SEQUENTIAL_RE = re.compile(r'(012|123|234|345|456|567|678|789|890)')
+_SHA1_HEX_RE = re.compile(r'[0-9A-Fa-f]{40}')
+
+# Character-class bits shared by the validator and the /auth/password-strength meter. Byte ->
+# class bit table, so an ASCII password is classified by one bytes.translate pass
+CHAR_LOWER, CHAR_UPPER, CHAR_DIGIT, CHAR_SPECIAL = 1, 2, 4, 8
+_CLASS_TABLE = bytes(
+    CHAR_LOWER if 97 <= b <= 122 else
+    CHAR_UPPER if 65 <= b <= 90 else
+    CHAR_DIGIT if 48 <= b <= 57 else
+    CHAR_SPECIAL if chr(b) in '!@#$%^&*(),.?":{}|<>' else 0
+    for b in range(256)
+)
+
+
+def character_classes(password: str) -> int:
+    """Bitmask of the character classes present, with the same meaning as the class regexes"""
+    if password.isascii():
+        classes = 0
+        for bit in set(password.encode('ascii').translate(_CLASS_TABLE)):
+            classes |= bit
+        return classes
+    # \d also matches non-ASCII digits, so keep the regexes for the rare non-ASCII password
+    return (
+        (CHAR_LOWER if _LOWER_RE.search(password) else 0)
+        | (CHAR_UPPER if _UPPER_RE.search(password) else 0)
+        | (CHAR_DIGIT if _DIGIT_RE.search(password) else 0)
+        | (CHAR_SPECIAL if _SPECIAL_RE.search(password) else 0)
+    )
+
+
+class BreachedPasswordFilter:
+    """
+    Bloom filter over SHA-1 password hashes, e.g. a HaveIBeenPwned "HASH:count" download
+    
+    Lookups hash the candidate once and probe a fixed number of bits, so a list of millions
+    of breached passwords costs about 1.8 MB per million entries at a 0.1% false-positive rate.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self._size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._hash_count = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+    
+    def _positions(self, digest: bytes):
+        # Double hashing from two independent halves of the SHA-1 digest
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:16], 'big') | 1
+        return ((h1 + i * h2) % self._size for i in range(self._hash_count))
+    
+    def add_digest(self, digest: bytes) -> None:
+        for position in self._positions(digest):
+            self._bits[position >> 3] |= 1 << (position & 7)
+    
+    def __contains__(self, password: str) -> bool:
+        digest = hashlib.sha1(password.encode('utf-8')).digest()
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+    
+    @classmethod
+    def from_file(cls, path: str) -> 'BreachedPasswordFilter':
+        """
+        Load hex SHA-1 hashes, one per line, ignoring any ":count" suffix
+        
+        Blank lines are skipped; lines that are not a 40-character hex digest are skipped
+        and counted in a single warning rather than inserted as bogus entries.
+        """
+        with open(path, 'r', encoding='ascii', errors='replace') as handle:
+            capacity = sum(1 for line in handle if line.strip())
+            handle.seek(0)
+            breached = cls(capacity)
+            malformed = 0
+            for line in handle:
+                entry = line.strip().partition(':')[0]
+                if not entry:
+                    continue
+                if not _SHA1_HEX_RE.fullmatch(entry):
+                    malformed += 1
+                    continue
+                breached.add_digest(bytes.fromhex(entry))
+        if malformed:
+            logger.warning("Skipped %d malformed lines in breached password list %s", malformed, path)
+        return breached
+
+
+def _load_breached_passwords(path: str) -> Optional[BreachedPasswordFilter]:
+    try:
+        return BreachedPasswordFilter.from_file(path)
+    except OSError as exc:
+        logger.warning("Breached password list %s not loaded: %s", path, exc)
+        return None
+
+
+# Optional breach list; stays None (check disabled) until load_breached_passwords runs
+breached_passwords: Optional[BreachedPasswordFilter] = None
+
+
+async def load_breached_passwords() -> None:
+    """Load the list named by BREACHED_PASSWORDS_PATH in a worker thread (application startup)"""
+    global breached_passwords
+    path = os.getenv("BREACHED_PASSWORDS_PATH")
+    if path:
+        breached_passwords = await asyncio.to_thread(_load_breached_passwords, path)
+
 
 class PasswordValidator:
     """Password validation and strength checking"""
@@ -18,6 +139,13 @@ class PasswordValidator:
     MIN_LENGTH = 8
     MAX_LENGTH = 128
     
+    COMMON_PASSWORDS = frozenset({
+        'password', '123456', '123456789', 'qwerty', 'abc123', 'monkey',
+        'letmein', 'dragon', '111111', 'baseball', 'iloveyou', 'trustno1',
+        'sunshine', 'master', '123123', 'welcome', 'shadow', 'ashley',
+        'football', 'jesus', 'michael', 'ninja', 'mustang', 'password1'
+    })
+    
     @staticmethod
     def validate_password(password: str) -> Tuple[bool, List[str]]:
         """
@@ -39,28 +167,24 @@ class PasswordValidator:
             issues.append(f"Password must be no more than {PasswordValidator.MAX_LENGTH} characters long")
         
         # Character type checks
-        if not re.search(r'[a-z]', password):
+        classes = character_classes(password)
+        if not classes & CHAR_LOWER:
             issues.append("Password must contain at least one lowercase letter")
         
-        if not re.search(r'[A-Z]', password):
+        if not classes & CHAR_UPPER:
             issues.append("Password must contain at least one uppercase letter")
         
-        if not re.search(r'\d', password):
+        if not classes & CHAR_DIGIT:
             issues.append("Password must contain at least one number")
         
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if not classes & CHAR_SPECIAL:
             issues.append("Password must contain at least one special character")
         
         # Common password checks
-        common_passwords = [
-            'password', '123456', '123456789', 'qwerty', 'abc123', 'monkey',
-            'letmein', 'dragon', '111111', 'baseball', 'iloveyou', 'trustno1',
-            'sunshine', 'master', '123123', 'welcome', 'shadow', 'ashley',
-            'football', 'jesus', 'michael', 'ninja', 'mustang', 'password1'
-        ]
-        
-        if password.lower() in common_passwords:
+        if password.lower() in PasswordValidator.COMMON_PASSWORDS:
             issues.append("Password is too common, please choose a more unique password")
+        elif breached_passwords is not None and password in breached_passwords:
+            issues.append("Password has appeared in a data breach, please choose a different password")
         
         return len(issues) == 0, issues
     
@@ -87,19 +211,20 @@ class PasswordValidator:
             score += 1
         
         # Character diversity
-        if re.search(r'[a-z]', password):
+        classes = character_classes(password)
+        if classes & CHAR_LOWER:
             score += 1
-        if re.search(r'[A-Z]', password):
+        if classes & CHAR_UPPER:
             score += 1
-        if re.search(r'\d', password):
+        if classes & CHAR_DIGIT:
             score += 1
-        if re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if classes & CHAR_SPECIAL:
             score += 1
         
         # Pattern checks
-        if not re.search(r'(.)\1{2,}', password):  # No repeated characters
+        if not _REPEATED_RE.search(password):  # No repeated characters
             score += 1
-        if not re.search(r'(012|123|234|345|456|567|678|789|890)', password):  # No sequential numbers
+        if not _SEQUENTIAL_RE.search(password):  # No sequential numbers
             score += 1
         
         # Strength levels
@@ -175,8 +300,7 @@ def validate_email(email: str) -> bool:
     Returns:
         True if email format is valid
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.fullmatch(email) is not None
 
 
 def sanitize_username(email: str) -> str:
@@ -189,9 +313,9 @@ def sanitize_username(email: str) -> str:
     Returns:
         Sanitized username
     """
-    username = email.split('@')[0]
+    username = email.split('@', 1)[0]
     # Remove special characters, keep only alphanumeric and underscore
-    username = re.sub(r'[^a-zA-Z0-9_]', '', username)
+    username = _USERNAME_STRIP_RE.sub('', username)
     return username.lower()[:50]  # Limit length
 
 
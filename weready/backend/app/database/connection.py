@@ -5,7 +5,12 @@ SQLAlchemy database setup for WeReady authentication system.
 """
 
 import os
-from sqlalchemy import create_engine
+import asyncio
+import logging
+from fastapi import HTTPException, status
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
@@ -15,16 +20,61 @@ load_dotenv()
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./weready.db")
+# Pool sizing for server databases; overflow absorbs bursts, recycle drops connections
+# before server-side idle timeouts can kill them mid-request
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "3600"))
 
 # For SQLite, add check_same_thread=False for development
 if DATABASE_URL.startswith("sqlite"):
     engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 else:
-    engine = create_engine(DATABASE_URL)
+    # Keep enough warm connections that per-request primary-key lookups don't queue on checkout
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=True,
+    )
 
 # Create sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def _async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its asyncio driver (aiosqlite / asyncpg)"""
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    for prefix in ("postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_database_url(DATABASE_URL))
+# Seconds a request may wait for a pooled connection before failing with 503 instead of queuing
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "2"))
+# Connections opened at startup; a handful covers typical concurrency (5 + overflow serves ~10
+# concurrent users comfortably), the rest of the pool fills lazily
+DB_POOL_WARM_CONNECTIONS = int(os.getenv("DB_POOL_WARM_CONNECTIONS", "5"))
+
+# Async engine for endpoints that should not block the event loop on DB I/O
+if ASYNC_DATABASE_URL.startswith("sqlite"):
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+else:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=True,
+        pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+    )
+
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+# One session per asyncio task: everything awaited while serving a request shares it
+AsyncScopedSession = async_scoped_session(AsyncSessionLocal, scopefunc=asyncio.current_task)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -39,6 +89,41 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """
+    Async database dependency for FastAPI
+    Yields the request task's scoped AsyncSession and closes it when the request finishes
+    """
+    try:
+        yield AsyncScopedSession()
+    except PoolTimeoutError as exc:
+        # Pool exhausted for DB_POOL_TIMEOUT_SECONDS: fail fast rather than queue indefinitely
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database is busy, please retry shortly"
+        ) from exc
+    finally:
+        await AsyncScopedSession.remove()
+
+async def warm_async_pool(connections: int = DB_POOL_WARM_CONNECTIONS) -> None:
+    """Open pooled connections up front so early requests skip the connect handshake"""
+    opened = []
+    try:
+        for _ in range(max(0, connections)):
+            conn = await async_engine.connect()
+            opened.append(conn)
+            await conn.execute(text("SELECT 1"))
+    except Exception as exc:
+        logging.getLogger(__name__).warning("Database pool warm-up incomplete: %s", exc)
+    finally:
+        # Closing returns each connection to the pool, where it stays open for reuse
+        for conn in opened:
+            await conn.close()
+
+async def dispose_async_engine() -> None:
+    """Close every pooled async connection (on shutdown)"""
+    await async_engine.dispose()
+
 def create_tables():
     """Create all database tables"""
     from app.models.user import Base
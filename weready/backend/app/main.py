@@ -1,8 +1,11 @@
 import logging
+import logging.handlers
 import platform
+import queue
 import time
 import copy
 from collections import deque
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
@@ -58,10 +61,48 @@ from app.core.government_data_integrator import government_integrator
 from app.core.academic_research_integrator import academic_integrator
 from app.core.github_intelligence import github_intelligence
 from app.api import register_api_routes
-from app.auth.oauth import router as oauth_router
+from app.auth.oauth import router as oauth_router, close_oauth_transport, prefetch_oauth_metadata
+from app.auth.password_utils import load_breached_passwords
+from app.database.connection import dispose_async_engine, warm_async_pool
 from startup_validator import run_startup_validation
 
-app = FastAPI(title="WeReady API", version="0.1.0")
+
+def _queue_root_logging() -> Optional[logging.handlers.QueueListener]:
+    """Route root log records through a queue so handler I/O runs off the request path."""
+    root = logging.getLogger()
+    handlers = [handler for handler in root.handlers if not isinstance(handler, logging.handlers.QueueHandler)]
+    if not handlers:
+        return None
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Process-wide setup before the first request and teardown after the last one."""
+    log_listener = _queue_root_logging()
+    # Pre-open async DB connections so the first authenticated requests aren't cold
+    await warm_async_pool()
+    # Build the optional breached-password filter without blocking the event loop
+    await load_breached_passwords()
+    # Fetch OAuth discovery documents up front instead of on the first login
+    await prefetch_oauth_metadata()
+    try:
+        yield
+    finally:
+        await close_oauth_transport()
+        await dispose_async_engine()
+        # Drain queued log records before the process exits
+        if log_listener is not None:
+            log_listener.stop()
+
+
+app = FastAPI(title="WeReady API", version="0.1.0", lifespan=lifespan)
 
 logger = logging.getLogger("app.health")
 EXPECTED_BACKEND_PORT = int(os.getenv("BACKEND_PORT", "8000"))
@@ -157,6 +198,7 @@ brain = bailey_intelligence
 register_api_routes(app)
 app.include_router(oauth_router, prefix="/api", tags=["authentication"])
 
+
 class CodeScanRequest(BaseModel):
     code: Optional[str] = None
     language: str = "python"
@@ -7,8 +7,9 @@ Comprehensive user model supporting OAuth providers and profile enrichment.
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, JSON, Enum, Float
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Tuple
 from enum import Enum as PyEnum
 import json
 from passlib.context import CryptContext
@@ -18,6 +19,28 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 Base = declarative_base()
 
+# Length of the free trial granted on signup
+TRIAL_PERIOD = timedelta(days=7)
+
+
+def utc_now() -> datetime:
+    """Current time as an aware UTC datetime, the convention for every stored timestamp"""
+    return datetime.now(timezone.utc)
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Read a stored timestamp as aware UTC.
+    
+    SQLite hands DateTime(timezone=True) columns back without an offset; naive values are UTC
+    by convention, so they are tagged rather than converted.
+    """
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
 class UserRole(PyEnum):
     DEVELOPER = "developer"
     FOUNDER = "founder"
@@ -67,7 +90,9 @@ class User(Base):
     role = Column(Enum(UserRole), nullable=True)
     subscription_tier = Column(Enum(SubscriptionTier), default=SubscriptionTier.FREE)
     
-    # Trial and subscription tracking
+    # Trial and subscription tracking. All timestamps are written in UTC (utc_now) and read
+    # through as_utc. Rows written before this convention used server local time, so a server
+    # not running in UTC moves their trial/subscription end by its UTC offset.
     trial_started = Column(DateTime(timezone=True), nullable=True)
     trial_ends = Column(DateTime(timezone=True), nullable=True)
     trial_used = Column(Boolean, default=False)
@@ -170,6 +195,12 @@ class User(Base):
             self.linkedin_id = provider_data.get("id")
             self.linkedin_profile = provider_data
     
+    def get_oauth_provider(self, provider: OAuthProvider) -> Optional[Dict[str, Any]]:
+        """Get linked provider data by provider (a dict lookup on oauth_providers)"""
+        if not self.oauth_providers:
+            return None
+        return self.oauth_providers.get(provider.value)
+    
     def get_primary_avatar(self) -> Optional[str]:
         """Get the best available avatar URL"""
         if self.avatar_url:
@@ -202,23 +233,31 @@ class User(Base):
         
         return f"User {self.id}"
     
-    def is_trial_active(self) -> bool:
-        """Check if user's trial is currently active"""
+    def is_trial_active(self, now: Optional[datetime] = None) -> bool:
+        """Check if user's trial is active (at ``now``, default utc_now())"""
         if not self.trial_started or not self.trial_ends:
             return False
-        return datetime.now() < self.trial_ends
+        return as_utc(now or utc_now()) < as_utc(self.trial_ends)
+    
+    def trial_status(self, now: Optional[datetime] = None) -> Tuple[bool, int]:
+        """Return (trial active, whole days remaining) from a single clock reading"""
+        now = as_utc(now or utc_now())
+        if self.is_trial_active(now):
+            return True, (as_utc(self.trial_ends) - now).days
+        return False, 0
     
-    def is_subscription_active(self) -> bool:
-        """Check if user has active subscription"""
+    def is_subscription_active(self, now: Optional[datetime] = None) -> bool:
+        """Check if user has active subscription (at ``now``, default utc_now())"""
         if not self.subscription_started:
             return False
         if not self.subscription_ends:  # Lifetime or ongoing subscription
             return True
-        return datetime.now() < self.subscription_ends
+        return as_utc(now or utc_now()) < as_utc(self.subscription_ends)
     
     def can_analyze(self) -> bool:
         """Check if user can perform analysis based on tier and usage"""
-        if self.is_trial_active() or self.is_subscription_active():
+        now = utc_now()
+        if self.is_trial_active(now) or self.is_subscription_active(now):
             return True
         
         # Free tier limits
@@ -229,13 +268,12 @@ class User(Base):
     
     def start_trial(self) -> Dict[str, Any]:
         """Start 7-day trial for user"""
-        from datetime import datetime, timedelta
-        
         if self.trial_used:
             return {"success": False, "error": "Trial already used"}
         
-        self.trial_started = datetime.now()
-        self.trial_ends = datetime.now() + timedelta(days=7)
+        now = utc_now()
+        self.trial_started = now
+        self.trial_ends = now + TRIAL_PERIOD
         self.trial_used = True
         self.subscription_tier = SubscriptionTier.FOUNDER  # Full access during trial
         
@@ -247,8 +285,9 @@ class User(Base):
     
     def get_subscription_status(self) -> Dict[str, Any]:
         """Get current subscription status"""
-        if self.is_trial_active():
-            days_left = (self.trial_ends - datetime.now()).days
+        now = utc_now()
+        is_trial_active, days_left = self.trial_status(now)
+        if is_trial_active:
             return {
                 "status": "trial",
                 "tier": "founder",
@@ -256,7 +295,7 @@ class User(Base):
                 "trial_ends": self.trial_ends.isoformat()
             }
         
-        if self.is_subscription_active():
+        if self.is_subscription_active(now):
             return {
                 "status": "active",
                 "tier": self.subscription_tier.value,
@@ -284,8 +323,9 @@ class User(Base):
         return self.password_hash is not None
     
     @classmethod
-    def create_from_email_password(cls, email: str, password: str, full_name: str = None) -> 'User':
-        """Create user with email/password authentication"""
+    def create_from_email_password(cls, email: str, password: str, full_name: str = None,
+                                   now: Optional[datetime] = None) -> 'User':
+        """Create user with email/password authentication (trial starting at ``now``, default the current UTC time)"""
         user = cls(
             email=email,
             full_name=full_name or email.split('@')[0],
@@ -295,13 +335,45 @@ class User(Base):
         user.set_password(password)
         
         # Start trial automatically
-        user.trial_started = datetime.now()
-        user.trial_ends = datetime.now() + timedelta(days=7)
+        now = now or utc_now()
+        user.trial_started = now
+        user.trial_ends = now + TRIAL_PERIOD
         user.trial_used = True
         user.subscription_tier = SubscriptionTier.FOUNDER  # Full access during trial
         
         return user
 
+@dataclass(frozen=True)
+class UserSnapshot:
+    """
+    Read-only copy of the User columns auth routes read, safe to cache and share across
+    requests and sessions. Load the ORM row with ``db.get(User, snapshot.id)`` to write.
+    """
+    
+    id: int
+    email: str
+    username: Optional[str]
+    full_name: Optional[str]
+    avatar_url: Optional[str]
+    subscription_tier: SubscriptionTier
+    trial_started: Optional[datetime]
+    trial_ends: Optional[datetime]
+    subscription_started: Optional[datetime]
+    subscription_ends: Optional[datetime]
+    oauth_providers: Optional[Dict[str, Any]]
+    is_active: bool
+    created_at: Optional[datetime]
+    
+    # Same rules as the model; these only read the columns copied above
+    is_trial_active = User.is_trial_active
+    trial_status = User.trial_status
+    is_subscription_active = User.is_subscription_active
+    get_oauth_provider = User.get_oauth_provider
+    
+    @classmethod
+    def from_user(cls, user: User) -> 'UserSnapshot':
+        return cls(**{field.name: getattr(user, field.name) for field in fields(cls)})
+
 class UserSession(Base):
     """User session management for JWT tokens"""
     
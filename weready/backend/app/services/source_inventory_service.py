@@ -109,6 +109,24 @@ class SourceInventoryService:
         self.pipeline = pipeline or bailey_pipeline
         self.frontend_catalog = frontend_catalog or FRONTEND_SOURCE_CATALOG
 
+    @property
+    def frontend_catalog(self) -> List[Dict[str, str]]:
+        return self._frontend_catalog
+
+    @frontend_catalog.setter
+    def frontend_catalog(self, entries: List[Dict[str, str]]) -> None:
+        # Assigning is how the catalog is (re)loaded, so the ID index is dropped here and only
+        # here; replace the list rather than editing it in place.
+        self._frontend_catalog = entries
+        self._catalog_lookup: Optional[Dict[str, Dict[str, str]]] = None
+
+    @property
+    def catalog_lookup(self) -> Dict[str, Dict[str, str]]:
+        """Frontend catalog entries keyed by ID, built once per catalog load."""
+        if self._catalog_lookup is None:
+            self._catalog_lookup = {entry["id"]: entry for entry in self._frontend_catalog}
+        return self._catalog_lookup
+
     # ------------------------------------------------------------------
     # Inventory and status helpers
     # ------------------------------------------------------------------
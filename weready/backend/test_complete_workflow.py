@@ -88,7 +88,7 @@ def test_complete_workflow():
     print("      - Trial: 7 days FREE")
     print(f"   🔗 Links analysis {analysis_id} to user account")
     print("   🎫 Generates JWT tokens")
-    print("   ↪️  Redirects to: /auth/callback?access_token=...&trial_days=7")
+    print("   ↪️  Redirects to: /auth/callback#access_token=...&trial_days=7")
     
     # Step 4: Dashboard Experience
     print("\n📈 STEP 4: User lands in Dashboard")
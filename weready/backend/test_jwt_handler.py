@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Tests for JWT signing/verification and the per-worker user cache
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import time
+
+import orjson
+import pytest
+
+from app.auth import jwt_handler
+from app.auth.jwt_handler import SECRET_KEY, _decode_hs256, _encode_hs256, forget_user, load_user
+from app.models.user import SubscriptionTier, TRIAL_PERIOD, User, UserSnapshot, utc_now
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    jwt_handler._user_cache.clear()
+    jwt_handler._token_cache.clear()
+    yield
+    jwt_handler._user_cache.clear()
+    jwt_handler._token_cache.clear()
+
+
+def _add_user(session_factory, **columns) -> int:
+    async def add():
+        async with session_factory() as db:
+            now = utc_now()
+            user = User(
+                email="cache@example.com",
+                full_name="Cached User",
+                subscription_tier=SubscriptionTier.FREE,
+                trial_started=now,
+                trial_ends=now + TRIAL_PERIOD,
+                **columns
+            )
+            db.add(user)
+            await db.commit()
+            return user.id
+
+    return asyncio.run(add())
+
+
+def test_load_user_caches_an_immutable_snapshot(session_factory):
+    user_id = _add_user(session_factory)
+
+    async def load_twice():
+        async with session_factory() as db:
+            first = await load_user(db, user_id)
+        # A later request with its own session gets the cached copy, not a session-bound row
+        async with session_factory() as db:
+            second = await load_user(db, user_id)
+        return first, second
+
+    first, second = asyncio.run(load_twice())
+    assert isinstance(first, UserSnapshot)
+    assert second is first
+    assert first.email == "cache@example.com"
+    assert first.trial_status()[0] is True
+    with pytest.raises(AttributeError):
+        first.full_name = "Changed"
+
+
+def test_forget_user_reloads_changed_columns(session_factory):
+    user_id = _add_user(session_factory)
+
+    async def update_and_reload():
+        async with session_factory() as db:
+            await load_user(db, user_id)
+            user = await db.get(User, user_id)
+            user.full_name = "Renamed User"
+            await db.commit()
+        async with session_factory() as db:
+            stale = await load_user(db, user_id)
+        forget_user(user_id)
+        async with session_factory() as db:
+            fresh = await load_user(db, user_id)
+        return stale, fresh
+
+    stale, fresh = asyncio.run(update_and_reload())
+    assert stale.full_name == "Cached User"
+    assert fresh.full_name == "Renamed User"
+
+
+def test_load_user_returns_none_for_unknown_id(session_factory):
+    async def load():
+        async with session_factory() as db:
+            return await load_user(db, 12345)
+
+    assert asyncio.run(load()) is None
+
+
+# HS256 sign/verify path (the default JWT_ALGORITHM)
+
+
+def _segment(data: dict) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(data)).rstrip(b"=").decode("ascii")
+
+
+def _claims(**overrides) -> dict:
+    now = int(time.time())
+    claims = {"user_id": 7, "email": "hs@example.com", "iat": now, "exp": now + 300, "type": "access"}
+    claims.update(overrides)
+    return {key: value for key, value in claims.items() if value is not None}
+
+
+def test_hs256_round_trip():
+    claims = _claims()
+    assert _decode_hs256(_encode_hs256(claims)) == claims
+
+
+def test_hs256_rejects_tampered_signature_and_payload():
+    token = _encode_hs256(_claims())
+    header, payload, signature = token.split(".")
+    flipped = ("A" if signature[0] != "A" else "B") + signature[1:]
+    assert _decode_hs256(f"{header}.{payload}.{flipped}") is None
+    forged_payload = _segment(_claims(user_id=8))
+    assert _decode_hs256(f"{header}.{forged_payload}.{signature}") is None
+
+
+def test_hs256_rejects_alg_none_and_mismatched_header():
+    payload = _segment(_claims())
+    assert _decode_hs256(f"{_segment({'alg': 'none', 'typ': 'JWT'})}.{payload}.") is None
+    # A correct HMAC-SHA256 signature under a header naming another algorithm is still rejected
+    signing_input = f"{_segment({'alg': 'HS512', 'typ': 'JWT'})}.{payload}"
+    signature = hmac.new(SECRET_KEY.encode(), signing_input.encode(), hashlib.sha256).digest()
+    signature_b64 = base64.urlsafe_b64encode(signature).rstrip(b"=").decode("ascii")
+    assert _decode_hs256(f"{signing_input}.{signature_b64}") is None
+
+
+def test_hs256_rejects_expired_and_future_dated_tokens():
+    now = int(time.time())
+    assert _decode_hs256(_encode_hs256(_claims(exp=now - 1))) is None
+    assert _decode_hs256(_encode_hs256(_claims(nbf=now + 60))) is None
+    assert _decode_hs256(_encode_hs256(_claims(iat=now + 60))) is None
+    assert _decode_hs256(_encode_hs256(_claims(iat="yesterday"))) is None
+
+
+def test_hs256_rejects_missing_required_claims():
+    assert _decode_hs256(_encode_hs256(_claims(user_id=None))) is None
+    assert _decode_hs256(_encode_hs256(_claims(exp=None))) is None
+
+
+def test_hs256_rejects_malformed_tokens():
+    for token in ("", "not-a-jwt", "a.b", "a.b.c", "ü.ü.ü"):
+        assert _decode_hs256(token) is None
+
+
+def test_hs256_accepts_tokens_issued_by_pyjwt():
+    pyjwt = pytest.importorskip("jwt")
+    claims = _claims()
+    token = pyjwt.encode(claims, SECRET_KEY, algorithm="HS256")
+    assert _decode_hs256(token) == claims
+    # Non-canonical header layout from another issuer still verifies on the slow path
+    token = pyjwt.encode(claims, SECRET_KEY, algorithm="HS256", headers={"kid": "primary"})
+    assert _decode_hs256(token) == claims
+
+
+def test_load_user_skips_the_database_for_non_integer_ids():
+    # db=None: any attempt to query would raise, as asyncpg does for a string primary key
+    for user_id in ("demo_1a2b3c4d", "7", None, True):
+        assert asyncio.run(load_user(None, user_id)) is None
+
+
+def test_revocation_set_refuses_new_entries_instead_of_evicting_live_ones(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(jwt_handler.time, "monotonic", lambda: clock[0])
+    revoked = jwt_handler.RevocationSet(2)
+    revoked.add("first", 10)
+    revoked.add("second", 60)
+    with pytest.raises(jwt_handler.RevocationStoreFull):
+        revoked.add("third", 60)
+    assert "first" in revoked and "second" in revoked and "third" not in revoked
+
+    # Re-revoking a held key never needs a free slot
+    revoked.add("first", 10)
+
+    # Expired entries free their slot; live ones are still held
+    clock[0] += 11
+    assert "first" not in revoked
+    revoked.add("third", 60)
+    assert "second" in revoked and "third" in revoked
+    assert len(revoked) == 2
+
+
+def test_asymmetric_algorithms_require_both_key_files(tmp_path, monkeypatch):
+    monkeypatch.delenv("JWT_PRIVATE_KEY_PATH", raising=False)
+    monkeypatch.delenv("JWT_PUBLIC_KEY_PATH", raising=False)
+    with pytest.raises(RuntimeError, match="JWT_PRIVATE_KEY_PATH"):
+        jwt_handler._load_asymmetric_keys("EdDSA")
+
+    private_key = jwt_handler.JsonWebKey.generate_key("OKP", "Ed25519", is_private=True)
+    private_path = tmp_path / "jwt_private.pem"
+    private_path.write_bytes(private_key.as_pem(is_private=True))
+    monkeypatch.setenv("JWT_PRIVATE_KEY_PATH", str(private_path))
+    with pytest.raises(RuntimeError, match="JWT_PUBLIC_KEY_PATH"):
+        jwt_handler._load_asymmetric_keys("EdDSA")
+
+    public_path = tmp_path / "jwt_public.pem"
+    public_path.write_bytes(b"not a pem key")
+    monkeypatch.setenv("JWT_PUBLIC_KEY_PATH", str(public_path))
+    with pytest.raises(RuntimeError, match="could not parse"):
+        jwt_handler._load_asymmetric_keys("EdDSA")
+
+    public_path.write_bytes(private_key.as_pem(is_private=False))
+    signing_key, verify_key = jwt_handler._load_asymmetric_keys("EdDSA")
+    eddsa = jwt_handler.JsonWebToken(["EdDSA"])
+    token = eddsa.encode({"alg": "EdDSA"}, {"user_id": 1}, signing_key)
+    assert eddsa.decode(token, verify_key)["user_id"] == 1
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Tests for the auth routes in app.auth.oauth, run against a throwaway SQLite database
+"""
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.auth import jwt_handler
+from app.auth.jwt_handler import create_access_token, create_refresh_token, create_token_pair
+from app.auth.oauth import _token_claims, _upsert_oauth_user, router
+from app.auth.password_utils import password_validator
+from app.database.connection import get_async_db
+from app.models.analysis import Analysis
+from app.models.user import SubscriptionTier, TRIAL_PERIOD, User, as_utc, utc_now
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    jwt_handler._user_cache.clear()
+    jwt_handler._token_cache.clear()
+    yield
+    jwt_handler._user_cache.clear()
+    jwt_handler._token_cache.clear()
+
+
+@pytest.fixture
+def client(session_factory):
+    app = FastAPI()
+    app.include_router(router)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _add_user(session_factory, **columns) -> int:
+    async def add():
+        async with session_factory() as db:
+            now = utc_now()
+            values = dict(
+                email="route@example.com",
+                full_name="Route User",
+                subscription_tier=SubscriptionTier.FREE,
+                trial_started=now,
+                trial_ends=now + TRIAL_PERIOD,
+            )
+            values.update(columns)
+            user = User(**values)
+            db.add(user)
+            await db.commit()
+            return user.id
+
+    return asyncio.run(add())
+
+
+def _bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _load(session_factory, user_id: int) -> User:
+    async def load():
+        async with session_factory() as db:
+            return await db.get(User, user_id)
+
+    return asyncio.run(load())
+
+
+def test_me_answers_from_profile_claims(client, session_factory):
+    user_id = _add_user(session_factory, avatar_url="https://example.com/a.png")
+    user = _load(session_factory, user_id)
+    access_token = create_access_token({"sub": user.email, **_token_claims(user)})
+
+    # Claims are a snapshot taken at issue time; later row changes show up on the next token
+    async def rename():
+        async with session_factory() as db:
+            (await db.get(User, user_id)).full_name = "Renamed Later"
+            await db.commit()
+
+    asyncio.run(rename())
+    response = client.get("/auth/me", headers=_bearer(access_token))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["id"] == user_id
+    assert body["email"] == "route@example.com"
+    assert body["name"] == "Route User"
+    assert body["avatar_url"] == "https://example.com/a.png"
+    assert body["subscription_tier"] == "free"
+    assert body["is_trial_active"] is True
+    assert body["trial_days_remaining"] == 6
+    assert body["created_at"] == user.created_at.isoformat()
+
+
+def test_me_falls_back_to_database_for_tokens_without_profile_claims(client, session_factory):
+    user_id = _add_user(session_factory)
+    access_token = create_access_token({"sub": "route@example.com", "user_id": user_id})
+
+    response = client.get("/auth/me", headers=_bearer(access_token))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["id"] == user_id
+    assert body["name"] == "Route User"
+    assert body["subscription_tier"] == "free"
+    assert body["is_trial_active"] is True
+
+
+def test_me_rejects_unknown_users_and_bad_tokens(client):
+    access_token = create_access_token({"sub": "ghost@example.com", "user_id": 404})
+    assert client.get("/auth/me", headers=_bearer(access_token)).status_code == 401
+    assert client.get("/auth/me", headers=_bearer("not-a-token")).status_code == 401
+    assert client.get("/auth/me").status_code == 401
+
+
+def test_demo_tokens_get_401_instead_of_a_database_lookup(client):
+    demo_claims = {"user_id": "demo_1a2b3c4d", "email": "demo@weready.dev", "full_name": "Demo User"}
+    access_token = create_access_token({"sub": demo_claims["email"], **demo_claims})
+    assert client.get("/auth/me", headers=_bearer(access_token)).status_code == 401
+
+    refresh_token = create_token_pair(demo_claims)["refresh_token"]
+    assert client.post("/auth/refresh", params={"refresh_token": refresh_token}).status_code == 401
+
+
+def test_demo_logins_get_their_own_fresh_token_pairs(client):
+    credentials = {"email": "demo@weready.dev", "password": "anything"}
+    first = client.post("/auth/login", json=credentials).json()
+    second = client.post("/auth/login", json=credentials).json()
+    assert first["refresh_token"] != second["refresh_token"]
+    assert first["expires_in"] == jwt_handler._ACCESS_TOKEN_LIFETIME_SECONDS
+
+    # Logging one caller out leaves the other's session alone
+    client.post("/auth/logout", headers=_bearer(first["access_token"]), json={"refresh_token": first["refresh_token"]})
+    assert jwt_handler.verify_access_token(first["access_token"]) is None
+    assert jwt_handler.verify_access_token(second["access_token"]) is not None
+
+
+def test_login_validates_and_normalizes_emails(client):
+    assert client.post("/auth/login", json={"email": "demo@weready.dev\n", "password": "x"}).status_code == 422
+    assert client.post("/auth/login", json={"email": "nobody@localhost", "password": "x"}).status_code == 422
+
+    response = client.post("/auth/login", json={"email": "Someone@Acme.DEMO", "password": "x"})
+    assert response.status_code == 200
+    assert response.json()["user"]["email"] == "Someone@acme.demo"
+
+
+def test_refresh_rejects_invalid_tokens_with_401(client):
+    assert client.post("/auth/refresh", params={"refresh_token": "not-a-token"}).status_code == 401
+
+
+def test_refresh_issues_access_token_for_known_user(client, session_factory):
+    user_id = _add_user(session_factory)
+    refresh_token = create_refresh_token({"sub": "route@example.com", "user_id": user_id})
+
+    response = client.post("/auth/refresh", params={"refresh_token": refresh_token})
+
+    assert response.status_code == 200
+    assert jwt_handler.verify_access_token(response.json()["access_token"])["user_id"] == user_id
+
+
+def test_logout_revokes_tokens_sent_in_header_and_body(client, session_factory):
+    user_id = _add_user(session_factory)
+    tokens = create_token_pair({"sub": "route@example.com", "user_id": user_id})
+
+    response = client.post(
+        "/auth/logout",
+        headers=_bearer(tokens["access_token"]),
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+
+    assert response.status_code == 200
+    assert client.get("/auth/me", headers=_bearer(tokens["access_token"])).status_code == 401
+    assert client.post("/auth/refresh", params={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+
+def test_logout_without_tokens_still_succeeds(client):
+    assert client.post("/auth/logout").status_code == 200
+
+
+def test_logout_refuses_when_the_revocation_store_is_full(client, session_factory, monkeypatch):
+    user_id = _add_user(session_factory)
+    tokens = create_token_pair({"user_id": user_id, "email": "route@example.com"})
+    monkeypatch.setattr(jwt_handler, "_revoked_jtis", jwt_handler.RevocationSet(0))
+
+    response = client.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 503
+    # Nothing was dropped to make room, and the token was not reported as revoked
+    assert client.post("/auth/refresh", params={"refresh_token": tokens["refresh_token"]}).status_code == 200
+
+
+def test_strength_meter_classifies_characters_like_the_validator(client):
+    # Non-ASCII letters count as neither case for the validator, so the meter must agree
+    password = "éééééééé1!A"
+    response = client.post("/auth/password-strength", json={"password": password})
+    assert response.status_code == 200
+    assert "Include lowercase letters" in response.json()["feedback"]
+    assert not password_validator.validate_password(password)[0]
+
+
+def _github_info(**overrides) -> dict:
+    info = {
+        "id": 4242,
+        "email": "octo@example.com",
+        "name": "Octo Cat",
+        "username": "octocat",
+        "avatar_url": "https://avatars.example.com/octo.png",
+    }
+    info.update(overrides)
+    return info
+
+
+def _upsert(session_factory, user_info: dict, now: datetime):
+    async def run():
+        async with session_factory() as db:
+            user, is_new_user = await _upsert_oauth_user(db, "github", user_info, now)
+            await db.commit()
+            return user, is_new_user
+
+    return asyncio.run(run())
+
+
+def test_oauth_upsert_inserts_new_users(session_factory):
+    now = utc_now()
+    user, is_new_user = _upsert(session_factory, _github_info(), now)
+
+    assert is_new_user is True
+    assert user.id is not None
+    assert user.full_name == "Octo Cat"
+    assert user.github_id == "4242"
+    assert user.oauth_providers["github"]["username"] == "octocat"
+    assert user.subscription_tier == SubscriptionTier.FREE
+    assert as_utc(user.trial_ends) == now + TRIAL_PERIOD
+    assert user.last_login is None
+
+
+def test_oauth_upsert_refreshes_existing_users_without_clearing_missing_fields(session_factory):
+    first_login = utc_now()
+    created, _ = _upsert(session_factory, _github_info(), first_login)
+
+    later = utc_now()
+    user, is_new_user = _upsert(session_factory, _github_info(name=None, avatar_url=None), later)
+
+    assert is_new_user is False
+    assert user.id == created.id
+    assert user.full_name == "Octo Cat"
+    assert user.avatar_url == "https://avatars.example.com/octo.png"
+    assert as_utc(user.last_login) == later
+    # Trial window is set once, at sign-up
+    assert as_utc(user.trial_ends) == first_login + TRIAL_PERIOD
+
+    renamed, _ = _upsert(session_factory, _github_info(name="Octo Renamed"), utc_now())
+    assert renamed.full_name == "Octo Renamed"
+
+
+def test_oauth_upsert_rejects_unsupported_dialects():
+    mysql_session = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
+    with pytest.raises(RuntimeError, match="mysql"):
+        asyncio.run(_upsert_oauth_user(mysql_session, "github", _github_info(), utc_now()))
+
+
+def _add_unclaimed_analysis(session_factory) -> int:
+    async def add():
+        async with session_factory() as db:
+            analysis = Analysis(
+                repository_url="https://github.com/octo/repo",
+                overall_score=70.0,
+                code_quality_score=70.0,
+                business_model_score=70.0,
+                investment_ready_score=70.0,
+                verdict="needs_work",
+            )
+            db.add(analysis)
+            await db.commit()
+            return analysis.id
+
+    return asyncio.run(add())
+
+
+def _fake_github_provider(monkeypatch, user_info: dict) -> None:
+    from app.auth import oauth
+
+    async def authorize_access_token(request):
+        return {"access_token": "provider-token"}
+
+    async def fetch_user_info(token):
+        return user_info
+
+    monkeypatch.setitem(oauth.OAUTH_CLIENTS, "github", SimpleNamespace(authorize_access_token=authorize_access_token))
+    monkeypatch.setitem(oauth.USER_INFO_FETCHERS, "github", fetch_user_info)
+
+
+def test_oauth_callback_claims_the_pending_analysis_before_redirecting(client, session_factory, monkeypatch):
+    from app.auth import oauth
+
+    analysis_id = _add_unclaimed_analysis(session_factory)
+    _fake_github_provider(monkeypatch, _github_info())
+
+    response = client.get(f"/auth/github/callback?state=nonce.{analysis_id}", follow_redirects=False)
+    assert response.headers["location"].startswith(oauth.FRONTEND_CALLBACK_URL)
+
+    async def owner():
+        async with session_factory() as db:
+            return (await db.get(Analysis, analysis_id)).user_id
+
+    assert asyncio.run(owner()) is not None
+
+
+def test_oauth_callback_rolls_back_the_signup_when_the_claim_fails(client, session_factory, monkeypatch):
+    from sqlalchemy import func, select, text
+    from app.auth import oauth
+
+    analysis_id = _add_unclaimed_analysis(session_factory)
+    _fake_github_provider(monkeypatch, _github_info())
+    monkeypatch.setattr(oauth, "_CLAIM_ANALYSIS", text("UPDATE no_such_table SET user_id = :owner_id"))
+
+    response = client.get(f"/auth/github/callback?state=nonce.{analysis_id}", follow_redirects=False)
+    assert response.headers["location"] == oauth.OAUTH_ERROR_REDIRECT_URL
+
+    async def user_count():
+        async with session_factory() as db:
+            return (await db.execute(select(func.count()).select_from(User))).scalar_one()
+
+    assert asyncio.run(user_count()) == 0
+
+
+def test_metadata_ttl_starts_only_after_a_successful_prefetch(monkeypatch):
+    from app.auth import oauth
+
+    async def failing(client, force=False):
+        raise ConnectionError("discovery endpoint unreachable")
+
+    async def succeeding(client, force=False):
+        return None
+
+    monkeypatch.setattr(oauth, "_metadata_loaded_at", 0.0)
+    monkeypatch.setattr(oauth, "_prefetch_provider_metadata", failing)
+    asyncio.run(oauth.prefetch_oauth_metadata())
+    retry_in = oauth._metadata_loaded_at + oauth.OAUTH_METADATA_TTL_SECONDS - oauth.time.monotonic()
+    assert 0 < retry_in <= oauth.OAUTH_METADATA_RETRY_SECONDS
+
+    monkeypatch.setattr(oauth, "_prefetch_provider_metadata", succeeding)
+    asyncio.run(oauth.prefetch_oauth_metadata(force=True))
+    fresh_for = oauth._metadata_loaded_at + oauth.OAUTH_METADATA_TTL_SECONDS - oauth.time.monotonic()
+    assert fresh_for > oauth.OAUTH_METADATA_TTL_SECONDS - 5
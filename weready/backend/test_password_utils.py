@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for password validation and the optional breached-password filter
+"""
+
+import asyncio
+import hashlib
+
+import pytest
+
+from app.auth import password_utils
+from app.auth.password_utils import BreachedPasswordFilter, password_validator, validate_email
+
+BREACHED = ["Summer2024!", "P@ssw0rd123", "Tr0ub4dor&3", "correct horse battery staple"]
+
+
+def _sha1(password: str) -> str:
+    return hashlib.sha1(password.encode("utf-8")).hexdigest().upper()
+
+
+@pytest.fixture
+def breach_file(tmp_path):
+    lines = [f"{_sha1(password)}:{count}" for count, password in enumerate(BREACHED, start=1)]
+    # Blank, short, non-hex and lower-case entries mixed into an otherwise HIBP-style file
+    lines[1:1] = ["", "   ", "ABC123:5", "Z" * 40 + ":1", _sha1("lowercase-entry1!").lower()]
+    path = tmp_path / "pwned.txt"
+    path.write_text("\n".join(lines) + "\n", encoding="ascii")
+    return path
+
+
+def test_breach_filter_has_no_false_negatives(breach_file):
+    breached = BreachedPasswordFilter.from_file(str(breach_file))
+    for password in BREACHED + ["lowercase-entry1!"]:
+        assert password in breached
+
+
+def test_breach_filter_skips_malformed_lines(breach_file, caplog):
+    with caplog.at_level("WARNING"):
+        breached = BreachedPasswordFilter.from_file(str(breach_file))
+    assert "Skipped 2 malformed lines" in caplog.text
+    # Nothing a blank or malformed line could have inserted reads as breached
+    assert "" not in breached
+    assert "Another-Unlisted#Pass9" not in breached
+
+
+def test_breach_filter_false_positive_rate_stays_near_target():
+    breached = BreachedPasswordFilter(capacity=5000)
+    for index in range(5000):
+        breached.add_digest(hashlib.sha1(f"listed-{index}".encode()).digest())
+    false_positives = sum(f"unlisted-{index}" in breached for index in range(20000))
+    assert false_positives / 20000 < 0.005
+
+
+def test_validator_rejects_breached_passwords_once_loaded(breach_file, monkeypatch):
+    assert password_validator.validate_password("Summer2024!")[0] is True
+
+    monkeypatch.setenv("BREACHED_PASSWORDS_PATH", str(breach_file))
+    monkeypatch.setattr(password_utils, "breached_passwords", None)
+    asyncio.run(password_utils.load_breached_passwords())
+
+    is_valid, issues = password_validator.validate_password("Summer2024!")
+    assert is_valid is False
+    assert any("data breach" in issue for issue in issues)
+    assert password_validator.validate_password("Unlisted#Pass9")[0] is True
+
+
+def test_missing_breach_file_leaves_the_check_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("BREACHED_PASSWORDS_PATH", str(tmp_path / "missing.txt"))
+    monkeypatch.setattr(password_utils, "breached_passwords", None)
+    asyncio.run(password_utils.load_breached_passwords())
+    assert password_utils.breached_passwords is None
+
+
+def test_validate_email_matches_the_whole_string():
+    assert validate_email("octo@example.com")
+    assert not validate_email("octo@example.com\n")
+    assert not validate_email("octo@example.com trailing")
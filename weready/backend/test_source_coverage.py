@@ -59,3 +59,16 @@ def test_coverage_summary_reports_by_category(inventory_service: SourceInventory
     assert operations is not None
     assert operations["implemented"] == 0
     assert operations["total"] >= 2
+
+
+def test_catalog_lookup_is_rebuilt_when_the_catalog_is_reloaded(pipeline: BaileyDataPipeline) -> None:
+    service = SourceInventoryService(
+        pipeline=pipeline,
+        frontend_catalog=[{"id": "alpha", "name": "Alpha", "category": "core_sources"}],
+    )
+    assert service.catalog_lookup["alpha"]["name"] == "Alpha"
+    assert service.catalog_lookup is service.catalog_lookup
+
+    # Same length, different entry: the reload must not serve the old index
+    service.frontend_catalog = [{"id": "beta", "name": "Beta", "category": "core_sources"}]
+    assert set(service.catalog_lookup) == {"beta"}
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Iterator
 
 import pytest
 from fastapi.testclient import TestClient
 
+from app.api import sources
 from app.main import app
 
 
@@ -80,3 +82,49 @@ def test_runtime_metrics_endpoint_exposes_counters(api_client: TestClient) -> No
     metrics = response.json()
     assert "health_requests" in metrics
     assert metrics["health_requests"] >= 1
+
+
+def _health_history(api_client: TestClient, source_id: str) -> list:
+    payload = api_client.get("/api/sources/health", params={"force": "true"}).json()
+    return payload["sources"][source_id]["healthHistory"]
+
+
+def test_source_test_keeps_fixed_length_health_history(api_client: TestClient) -> None:
+    history = _health_history(api_client, "github_api")
+    assert len(history) == sources.HEALTH_HISTORY_LENGTH
+
+    for _ in range(3):
+        assert api_client.post("/api/sources/github_api/test").status_code == 200
+        latest = round(sources.SOURCE_BASELINES["github_api"]["uptime"], 1)
+
+        updated = _health_history(api_client, "github_api")
+        # Newest sample lands on the right; the oldest falls off the left
+        assert updated == history[1:] + [latest]
+        history = updated
+
+
+def test_record_health_sample_drops_the_oldest_sample_when_full() -> None:
+    baseline = {"health_history": [90, 91, 92, 93, 94, 95, 96, 97]}
+    sources._record_health_sample(baseline, 98.5)
+    assert list(baseline["health_history"]) == [91, 92, 93, 94, 95, 96, 97, 98.5]
+
+    fresh: dict = {}
+    sources._record_health_sample(fresh, 99.0)
+    assert list(fresh["health_history"]) == [0] * (sources.HEALTH_HISTORY_LENGTH - 1) + [99.0]
+
+
+def test_first_source_test_seeds_baseline_from_defaults_not_snapshot(monkeypatch) -> None:
+    class DegradedService:
+        def get_status_snapshot(self):
+            return {"fresh_source": {"name": "Fresh", "uptime": 40.0, "error_rate": 30.0, "status": "offline"}}
+
+    monkeypatch.setattr(sources, "SOURCE_BASELINES", {})
+    result = asyncio.run(sources.trigger_source_test("fresh_source", service=DegradedService()))
+
+    baseline = sources.SOURCE_BASELINES["fresh_source"]
+    assert result.status == "online"
+    assert baseline["name"] == "fresh_source"
+    assert baseline["category"] == "Uncategorized"
+    assert 96.1 <= baseline["uptime"] <= 96.3
+    assert 1.7 <= baseline["error_rate"] <= 1.9
+    assert baseline["credibility"] == 90.0
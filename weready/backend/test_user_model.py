@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Tests for the User model's trial and subscription windows and its UTC timestamp convention
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.models.user import TRIAL_PERIOD, User, as_utc, utc_now
+
+
+def test_stored_timestamps_are_read_as_utc():
+    naive = datetime(2026, 1, 1, 12, 0)
+    assert as_utc(naive) == datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+    offset = datetime(2026, 1, 1, 14, 0, tzinfo=timezone(timedelta(hours=2)))
+    assert as_utc(offset) == datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+    assert as_utc(None) is None
+    assert utc_now().tzinfo is timezone.utc
+
+
+def test_trial_window_compares_naive_and_aware_values_as_utc():
+    started = datetime(2026, 1, 1, 12, 0)
+    # SQLite returns DateTime(timezone=True) columns naive; they hold UTC wall-clock times
+    user = User(trial_started=started, trial_ends=started + TRIAL_PERIOD)
+
+    just_before_end = datetime(2026, 1, 8, 11, 59, tzinfo=timezone.utc)
+    assert user.trial_status(just_before_end) == (True, 0)
+    assert user.trial_status(just_before_end.replace(tzinfo=None)) == (True, 0)
+    assert user.trial_status(datetime(2026, 1, 2, 12, 0, tzinfo=timezone.utc)) == (True, 6)
+    assert user.trial_status(datetime(2026, 1, 8, 12, 0, tzinfo=timezone.utc)) == (False, 0)
+    # The same instant expressed in another zone lands on the same side of the boundary
+    assert user.is_trial_active(datetime(2026, 1, 8, 13, 59, tzinfo=timezone(timedelta(hours=2))))
+
+
+def test_subscription_window_uses_utc():
+    ends = utc_now() + timedelta(hours=1)
+    user = User(subscription_started=utc_now(), subscription_ends=ends.replace(tzinfo=None))
+    assert user.is_subscription_active()
+    assert not user.is_subscription_active(ends)
+    assert User(subscription_started=utc_now()).is_subscription_active()
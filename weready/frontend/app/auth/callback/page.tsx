@@ -13,10 +13,14 @@ function AuthCallbackContent() {
   useEffect(() => {
     const handleCallback = async () => {
       try {
-        const accessToken = searchParams.get('access_token');
-        const refreshToken = searchParams.get('refresh_token');
-        const isNewUser = searchParams.get('is_new_user') === 'true';
-        const trialDays = searchParams.get('trial_days');
+        // Tokens arrive in the URL fragment so they never reach server logs
+        const params = new URLSearchParams(window.location.hash.slice(1));
+        window.history.replaceState(null, '', window.location.pathname);
+
+        const accessToken = params.get('access_token');
+        const refreshToken = params.get('refresh_token');
+        const isNewUser = params.get('is_new_user') === 'true';
+        const trialDays = params.get('trial_days');
 
         if (accessToken && refreshToken) {
           // Store tokens
@@ -101,13 +101,22 @@ export function AuthProvider({ children }: AuthProviderProps) {
   };
 
   const logout = () => {
+    const accessToken = localStorage.getItem('access_token');
+    const refreshTokenValue = localStorage.getItem('refresh_token');
     localStorage.removeItem('access_token');
     localStorage.removeItem('refresh_token');
     setUser(null);
     
-    // Call logout endpoint
+    // Call logout endpoint so the server rejects both tokens from now on
     fetch('http://localhost:8000/api/auth/logout', {
-      method: 'POST'
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(accessToken ? { 'Authorization': `Bearer ${accessToken}` } : {})
+      },
+      body: JSON.stringify({
+        refresh_token: refreshTokenValue
+      })
     }).catch(console.error);
   };
 